@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark slide construction and rendering.
+
+Usage: ./bench.py [-r REPEAT] [-k PATTERN] [--tags N] [-o FILE]
+                  [--compare FILE] [--threshold RATIO]
+
+Each slide builder is timed separately, split into constructing the figure and
+drawing it with Agg. The whole pipeline of `make.py` (creating every slide,
+adding the logo, and saving it), using its own functions, is also timed against
+the PDF, PNG and SVG backends. The timeline is built from a synthetic checkout
+with ``--tags`` release tags, so that no Matplotlib checkout is needed and
+results do not depend on its history.
+
+Results are written as JSON, along with the versions of Python, NumPy and
+Matplotlib. With ``--compare``, the fastest times are compared to those from an
+earlier run, e.g., with a different Matplotlib version, and the exit status is
+non-zero if any benchmark is slower by more than ``--threshold``. The fastest
+of several runs is used as it is least affected by other load on the machine.
+"""
+
+import argparse
+from datetime import datetime, timezone
+from functools import partial
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+import platform
+import re
+import sys
+import tempfile
+from time import perf_counter
+
+import numpy as np
+import matplotlib
+matplotlib.use('agg')
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+
+from mplslide import check_requirements
+# This must be called before importing other files to make the font available.
+check_requirements(checkout=False)  # noqa: F402
+
+import make
+import mplslide
+import title
+import news
+import timeline
+import feature32
+import feature33
+import docs
+import plan
+import end
+
+
+#: The default number of synthetic release tags for the timeline.
+TAG_COUNT = 1000
+#: The size of the grid of bars for the large 3D bar benchmark.
+BAR_GRID = (100, 100)
+#: The default ratio of fastest times above which a benchmark is a regression.
+THRESHOLD = 1.2
+
+
+def synthetic_checkout(path, count=TAG_COUNT):
+    """
+    Create a fake Matplotlib checkout with release tags for `timeline`.
+
+    Tags are written as packed refs, along with an up-to-date tag index, so
+    that the timeline does not need to run git.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        The directory in which to create the checkout.
+    count : int, default: `TAG_COUNT`
+        The number of release tags, spread evenly in time up to SciPy 2020.
+    """
+    git_dir = Path(path, '.git')
+    (git_dir / 'refs' / 'tags').mkdir(parents=True)
+    dates = np.linspace(np.datetime64('2003-05-01').astype(float),
+                        np.datetime64('2020-07-01').astype(float),
+                        count).astype('datetime64[D]')
+    releases = {}
+    for i, date in enumerate(dates):
+        name = f'v{i // 100}.{i // 10 % 10}.{i % 10}'
+        object_id = hashlib.sha1(name.encode()).hexdigest()
+        releases[name] = [object_id, str(date)]
+    with open(git_dir / 'packed-refs', 'w') as f:
+        f.write('# pack-refs with: peeled fully-peeled sorted \n')
+        for name, (object_id, _) in sorted(releases.items()):
+            f.write(f'{object_id} refs/tags/{name}\n')
+    (git_dir / timeline.TAG_INDEX).write_text(json.dumps({
+        'key': timeline.cache_key(path),
+        'releases': releases,
+    }))
+
+
+def _text_axes():
+    fig = mplslide.new_slide(plain=True)
+    title.create_text_axes(fig, 110)
+    return fig
+
+
+def _bar_grid():
+    fig = mplslide.new_slide()
+    ax = fig.add_subplot(projection='3d')
+    y, x = np.indices(BAR_GRID)
+    mplslide.shaded_bar3d(ax, x + y, plt.get_cmap('coolwarm')(
+        np.linspace(0, 1, x.size)))
+    return fig
+
+
+def builders(mpl_path):
+    """
+    Return the slide builders to benchmark.
+
+    Parameters
+    ----------
+    mpl_path : str or pathlib.Path
+        Path to the (synthetic) Matplotlib checkout for the timeline.
+
+    Returns
+    -------
+    dict
+        Functions returning slide factories, as for sections, by name.
+    """
+    return {
+        'title.slides': title.slides,
+        'title.create_text_axes': lambda: [_text_axes],
+        'news.slides': news.slides,
+        'timeline.slides': partial(timeline.slides, mpl_path),
+        'feature32.feature32_bar3d': lambda: [feature32.feature32_bar3d],
+        'mplslide.shaded_bar3d': lambda: [_bar_grid],
+        'feature33.formatter': lambda: [feature33.formatter],
+        'feature33.axline': lambda: [feature33.axline],
+        'feature33.mosaic': feature33.mosaic,
+        'feature33.sharing': lambda: [feature33.sharing],
+        'docs.docs': lambda: [docs.docs],
+        'plan.slides': plan.slides,
+        'end.slides': end.slides,
+    }
+
+
+def pages(mpl_path, features=None):
+    """
+    Return the sections of the presentation, as from `make.load_pages`.
+
+    Parameters
+    ----------
+    mpl_path : str or pathlib.Path
+        Path to the (synthetic) Matplotlib checkout for the timeline.
+    features : str or pathlib.Path, optional
+        A file of feature records, to include generated feature highlights.
+    """
+    section_args = {'timeline': (mpl_path, )}
+    if features:
+        section_args['features'] = (features, )
+    return make.load_pages(section_args)
+
+
+def time_builder(slides):
+    """
+    Construct and draw all slides from a builder once.
+
+    Returns
+    -------
+    dict
+        The time taken in each phase, in seconds.
+    """
+    construct = draw = 0
+    for slide in slides():
+        start = perf_counter()
+        fig = slide()
+        constructed = perf_counter()
+        fig.canvas.draw()
+        drawn = perf_counter()
+        mplslide.release_slide(fig)
+        construct += constructed - start
+        draw += drawn - constructed
+    return {'construct': construct, 'draw': draw}
+
+
+def time_pipeline(sections, fmt):
+    """
+    Create and save all slides in one format, as `make.py` does, once.
+
+    Returns
+    -------
+    dict
+        The total time taken, in seconds.
+    """
+    start = perf_counter()
+    buf = io.BytesIO()
+    if fmt == 'pdf':
+        with PdfPages(buf) as pdf:
+            for i, (page, *args) in enumerate(sections):
+                make.render_section(pdf, page, *args, section=i)
+    else:
+        for page, *args in sections:
+            for slide in make._section_slides(page, *args):
+                fig = make._create_slide(slide)
+                # As for PDF, vector output is rasterized at the resolution
+                # chosen for the slide.
+                fig.savefig(buf, format=fmt,
+                            dpi=(fig.mplslide_props['savefig_dpi']
+                                 if fmt == 'svg' else None))
+                mplslide.release_slide(fig)
+    return {'total': perf_counter() - start}
+
+
+def environment():
+    """
+    Return the versions and platform that results were measured on.
+    """
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'matplotlib': matplotlib.__version__,
+        'backend': matplotlib.get_backend(),
+        'font': mplslide.FONT.get_name(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+
+
+def run(benchmarks, repeat):
+    """
+    Run benchmarks, printing a line for each as it finishes.
+
+    Each benchmark is run once to warm up (e.g., to load fonts and fill
+    caches), and then *repeat* times.
+
+    Parameters
+    ----------
+    benchmarks : dict
+        Functions returning the time taken in each phase, by name.
+    repeat : int
+        The number of timed runs.
+
+    Returns
+    -------
+    dict
+        The times of every run, by phase, by benchmark name.
+    """
+    results = {}
+    for name, benchmark in benchmarks.items():
+        benchmark()
+        times = {}
+        for _ in range(repeat):
+            for phase, elapsed in benchmark().items():
+                times.setdefault(phase, []).append(elapsed)
+        results[name] = times
+        summary = ', '.join(f'{phase} {min(values):.4f}s'
+                            for phase, values in times.items())
+        print(f'{name:<28} {summary}')
+    return results
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """
+    Compare the fastest times to a baseline, printing a table of ratios.
+
+    Parameters
+    ----------
+    results, baseline : dict
+        Results, as written by this script.
+    threshold : float, default: `THRESHOLD`
+        The ratio of fastest times above which a benchmark is a regression.
+
+    Returns
+    -------
+    list of str
+        The benchmarks and phases that regressed.
+    """
+    print(f'\nCompared to Matplotlib {baseline["environment"]["matplotlib"]} '
+          f'(now {results["environment"]["matplotlib"]}):')
+    regressions = []
+    for name, times in results['results'].items():
+        for phase, values in times.items():
+            try:
+                old = baseline['results'][name][phase]
+            except KeyError:
+                continue
+            ratio = min(values) / min(old)
+            mark = ''
+            if ratio > threshold:
+                mark = '  SLOWER'
+                regressions.append(f'{name} ({phase})')
+            print(f'{name:<28} {phase:<10} {min(old):>8.4f}s '
+                  f'-> {min(values):>8.4f}s '
+                  f'{ratio:>6.2f}x{mark}')
+    return regressions
+
+
+def parse_args():
+    """
+    Parse command-line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description='Benchmark slide construction and rendering.')
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help='Number of timed runs of each benchmark. '
+                             '(default: %(default)s)')
+    parser.add_argument('-k', dest='pattern',
+                        help='Only run benchmarks whose name matches this '
+                             'regular expression.')
+    parser.add_argument('--tags', type=int, default=TAG_COUNT,
+                        help='Number of synthetic release tags for the '
+                             'timeline. (default: %(default)s)')
+    parser.add_argument('-o', '--output', default='bench.json',
+                        help='File to write results to. '
+                             '(default: %(default)s)')
+    parser.add_argument('--compare', metavar='FILE',
+                        help='Compare results to those in an earlier output.')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='Ratio of fastest times above which a '
+                             'benchmark is considered slower. '
+                             '(default: %(default)s)')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as mpl_path:
+        synthetic_checkout(mpl_path, args.tags)
+
+        benchmarks = {name: partial(time_builder, slides)
+                      for name, slides in builders(mpl_path).items()}
+        for fmt in ('pdf', 'png', 'svg'):
+            benchmarks[f'pipeline.{fmt}'] = partial(time_pipeline,
+                                                    pages(mpl_path), fmt)
+        if args.pattern:
+            benchmarks = {name: benchmark
+                          for name, benchmark in benchmarks.items()
+                          if re.search(args.pattern, name)}
+
+        results = {
+            'environment': environment(),
+            'parameters': {'repeat': args.repeat, 'tags': args.tags},
+            'results': run(benchmarks, args.repeat),
+        }
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            sys.exit('Slower than baseline: ' + ', '.join(regressions))
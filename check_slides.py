@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+
+"""
+Check slides for visual changes against baseline images.
+
+Usage: ./check_slides.py [-j JOBS] [-k PATTERN] [--tolerance RMS] [--update]
+                         [--baseline-dir DIR] [--result-dir DIR]
+                         [--features FILE]
+
+Every slide is rendered to PNG at `DPI`, as `make.py` would render it, and
+compared to a baseline image of the same name, passing if the RMS difference
+of their pixels is at most ``--tolerance``. With ``--update``, the baselines are replaced with the current
+renders instead. The timeline uses the same synthetic checkout as `bench.py`,
+so that baselines do not depend on the history of a Matplotlib checkout.
+Feature slides are checked if a file of records is given with ``--features``.
+
+Comparing images is only needed when a slide changes: the hashes of renders
+known to match each baseline are kept in `INDEX`, so a slide whose pixels hash
+the same is passed without decoding its baseline. Sections are rendered and
+checked in parallel, with ``-j JOBS`` worker processes.
+
+When a slide fails, its render and an image of the difference are written to
+``--result-dir``.
+
+Baselines are committed, along with the versions of Matplotlib and FreeType
+and the fonts they were rendered with, in `ENVIRONMENT`. Renders depend on
+these, so a warning is printed if they differ, and the baselines should be
+regenerated with ``--update`` (from a known good commit) when they change.
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import io
+import json
+from pathlib import Path
+import re
+import sys
+import tempfile
+
+import numpy as np
+import matplotlib
+import matplotlib.font_manager
+import matplotlib.ft2font
+from PIL import Image
+
+from bench import pages, synthetic_checkout
+import make
+import mplslide
+from slidecache import CACHE_DIR
+
+
+#: The resolution at which slides are rendered for comparison.
+DPI = 50
+#: The default maximum RMS difference of pixels for a slide to pass.
+TOLERANCE = 0.5
+#: The default directory of baseline images.
+BASELINE_DIR = 'baseline_images'
+#: The file, in the baseline directory, describing what the baselines were
+#: rendered with.
+ENVIRONMENT = 'environment.json'
+#: The default directory in which to write renders and differences that fail.
+RESULT_DIR = 'result_images'
+#: The file in which to store hashes of renders known to match each baseline.
+INDEX = Path(CACHE_DIR, 'check-slides.json')
+#: The number of matching render hashes to keep for each baseline.
+INDEX_SIZE = 4
+
+
+def _hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _pixels_hash(pixels):
+    return _hash(b'%d,%d:' % pixels.shape[:2] + pixels.tobytes())
+
+
+def environment():
+    """
+    Return what renders depend on, besides the slides themselves.
+    """
+    return {
+        'matplotlib': matplotlib.__version__,
+        'freetype': matplotlib.ft2font.__freetype_version__,
+        'fonts': [Path(matplotlib.font_manager.findfont(font)).name
+                  for font in (mplslide.FONT, mplslide.LOGO_FONT)],
+    }
+
+
+def render(page, *args):
+    """
+    Render all slides of a section, as in `make.py`, to RGBA images.
+
+    Yields
+    ------
+    numpy.ndarray
+        The image of each slide, with shape (height, width, 4).
+    """
+    for slide in make._section_slides(page, *args):
+        fig = make._create_slide(slide)
+        buf = io.BytesIO()
+        fig.savefig(buf, format='rgba', dpi=DPI)
+        width, height = (fig.get_size_inches() * DPI).round().astype(int)
+        mplslide.release_slide(fig)
+        yield np.frombuffer(buf.getbuffer(), np.uint8).reshape(height, width,
+                                                               4)
+
+
+def rms(expected, actual):
+    """
+    Return the RMS difference between two RGB(A) images, in the range 0-255.
+    """
+    if expected.shape[:2] != actual.shape[:2]:
+        return np.inf
+    diff = expected[..., :3].astype(float) - actual[..., :3]
+    return np.sqrt(np.mean(diff ** 2))
+
+
+def check_section(section, entry, known, baseline_dir, result_dir, tolerance,
+                  update=False):
+    """
+    Render the slides of one section and check them against baselines.
+
+    This is run in worker processes.
+
+    Parameters
+    ----------
+    section : int
+        The index of the section in `make.SECTIONS`, used to name images.
+    entry : tuple
+        The section's function and arguments, as from `make.load_pages`.
+    known : dict
+        The index entries for the baselines of this section, from `INDEX`.
+    baseline_dir, result_dir : pathlib.Path
+        The directories of baseline images, and of failed results.
+    tolerance : float
+        The maximum RMS difference for a slide to pass.
+    update : bool, default: False
+        Whether to write the renders as new baselines instead.
+
+    Returns
+    -------
+    list of dict
+        For each slide: its *name*, *status* (``'same'``, ``'passed'``,
+        ``'failed'``, ``'missing'`` or ``'updated'``), *rms* difference if it
+        was compared, and its new *index* entry.
+    """
+    page, *args = entry
+    results = []
+    for i, pixels in enumerate(render(page, *args)):
+        name = f'{section:02d}-{page.__module__}-{i:02d}'
+        path = baseline_dir / f'{name}.png'
+        current = _pixels_hash(pixels)
+        result = {'name': name, 'status': None, 'rms': None, 'index': None}
+        results.append(result)
+
+        if update:
+            Image.fromarray(pixels).save(path)
+            result['status'] = 'updated'
+            result['index'] = {'png': _hash(path.read_bytes()),
+                               'pixels': [current]}
+            continue
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            result['status'] = 'missing'
+            continue
+
+        # Only decode and compare images if this render is not known to
+        # match the baseline file as it is now.
+        record = known.get(name, {})
+        if record.get('png') != _hash(data):
+            record = {'png': _hash(data), 'pixels': []}
+        if current in record['pixels']:
+            result['status'] = 'same'
+            result['index'] = record
+            continue
+
+        expected = np.asarray(Image.open(io.BytesIO(data)).convert('RGBA'))
+        result['rms'] = rms(expected, pixels)
+        if result['rms'] <= tolerance:
+            result['status'] = 'passed'
+            record['pixels'] = [current, *record['pixels']][:INDEX_SIZE]
+        else:
+            result['status'] = 'failed'
+            Image.fromarray(pixels).save(result_dir / f'{name}.png')
+            if expected.shape == pixels.shape:
+                diff = np.abs(expected[..., :3].astype(int) - pixels[..., :3])
+                # Scale up differences so that small ones are visible.
+                diff = np.clip(diff * 10, 0, 255).astype(np.uint8)
+                Image.fromarray(diff).save(result_dir / f'{name}-diff.png')
+        result['index'] = record
+    return results
+
+
+def parse_args():
+    """
+    Parse command-line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description='Check slides for visual changes against baseline '
+                    'images.')
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help='Number of worker processes to render sections '
+                             'with; 0 uses all CPUs. (default: %(default)s)')
+    parser.add_argument('-k', dest='pattern',
+                        help='Only check slides from sections whose module '
+                             'name matches this regular expression.')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help='Maximum RMS difference of pixels for a slide to '
+                             'pass. (default: %(default)s)')
+    parser.add_argument('--update', action='store_true',
+                        help='Replace baseline images with the current '
+                             'slides.')
+    parser.add_argument('--baseline-dir', type=Path, default=BASELINE_DIR,
+                        help='Directory of baseline images. '
+                             '(default: %(default)s)')
+    parser.add_argument('--result-dir', type=Path, default=RESULT_DIR,
+                        help='Directory in which to write slides that fail. '
+                             '(default: %(default)s)')
+    parser.add_argument('--features', metavar='FILE',
+                        help='A CSV or JSON Lines file of feature records to '
+                             'check slides for.')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    args.baseline_dir.mkdir(parents=True, exist_ok=True)
+    args.result_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        index = json.loads(INDEX.read_text())
+    except (OSError, ValueError):
+        index = {}
+
+    with tempfile.TemporaryDirectory() as mpl_path:
+        synthetic_checkout(mpl_path)
+        # Sections are numbered as in the full presentation, so that names do
+        # not depend on which are checked.
+        sections = [(make.SECTIONS.index(entry[0].__module__), entry)
+                    for entry in pages(mpl_path, args.features)
+                    if not args.pattern or
+                    re.search(args.pattern, entry[0].__module__)]
+        with ProcessPoolExecutor(max_workers=args.jobs or None) as pool:
+            futures = [
+                pool.submit(check_section, i, entry,
+                            {name: value for name, value in index.items()
+                             if name.startswith(f'{i:02d}-')},
+                            args.baseline_dir, args.result_dir,
+                            args.tolerance, args.update)
+                for i, entry in sections]
+            results = [result
+                       for future in futures for result in future.result()]
+
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+        if result['index'] is not None:
+            index[result['name']] = result['index']
+        if result['status'] in ('failed', 'missing'):
+            rms_text = ('' if result['rms'] is None
+                        else f' (RMS {result["rms"]:.3f})')
+            print(f'{result["name"]}: {result["status"]}{rms_text}')
+    INDEX.parent.mkdir(parents=True, exist_ok=True)
+    INDEX.write_text(json.dumps(index, indent=2))
+
+    current = environment()
+    environment_path = args.baseline_dir / ENVIRONMENT
+    if args.update:
+        environment_path.write_text(json.dumps(current, indent=2) + '\n')
+    else:
+        try:
+            expected = json.loads(environment_path.read_text())
+        except (OSError, ValueError):
+            expected = current
+        for name, value in expected.items():
+            if current.get(name) != value:
+                print(f'WARNING: Baselines were rendered with {name} '
+                      f'{value}, but {current.get(name)} is in use; '
+                      f'differences may be due to this.')
+
+    print(', '.join(f'{count} {status}'
+                    for status, count in sorted(counts.items())))
+    if counts.get('missing'):
+        print(f'Baselines are missing from {args.baseline_dir}; to generate '
+              f'them, run {sys.argv[0]} --update on a known good commit.')
+    if counts.get('failed') or counts.get('missing'):
+        sys.exit(1)
@@ -2,39 +2,36 @@
 Documentation highlights.
 """
 
-from mplslide import FONT, BULLET, new_slide, slide_heading
+from mplslide import BULLET, text_slide
 
 
-def docs():
-    fig = new_slide()
-
-    slide_heading(fig, 'Documentation')
+#: The contents of the documentation slide; see `mplslide.layout_text`.
+DOCS = {
+    'heading': 'Documentation',
+    'fontsize': 56,
+    'items': [
+        {'text': 'Large and ongoing documentation rewrite', 'y': 0.8},
+        {'text': f'{BULLET} Refreshed homepage', 'level': 2},
+        {'text': f'{BULLET} 323 Pull Requests in 3.3 alone', 'level': 2},
 
-    props = dict(fontproperties=FONT, fontsize=56, alpha=0.7,
-                 verticalalignment='top')
+        {'text': "3.3 What's New?", 'y': 0.5},
+        {'text': 'https://matplotlib.org/3.3.0/users/whats_new.html',
+         'level': 2,
+         'url': 'https://matplotlib.org/3.3.0/users/whats_new.html'},
 
-    fig.text(0.05, 0.8, 'Large and ongoing documentation rewrite', **props)
-    fig.text(0.1, 0.8, f'\n{BULLET} Refreshed homepage', **props)
-    fig.text(0.1, 0.8, f'\n\n{BULLET} 323 Pull Requests in 3.3 alone', **props)
+        {'text': 'Cheatsheets! By @rougier', 'y': 0.3},
+        {'text': 'https://github.com/matplotlib/cheatsheets/', 'level': 2,
+         'url': 'https://github.com/matplotlib/cheatsheets/'},
+    ],
+}
 
-    fig.text(0.05, 0.5, "3.3 What's New?", **props)
-    t = fig.text(0.1, 0.5,
-                 '\nhttps://matplotlib.org/3.3.0/users/whats_new.html',
-                 **props)
-    t.set_url('https://matplotlib.org/3.3.0/users/whats_new.html')
 
-    fig.text(0.05, 0.3, 'Cheatsheets! By @rougier', **props)
-    t = fig.text(0.1, 0.3, '\nhttps://github.com/matplotlib/cheatsheets/',
-                 **props)
-    t.set_url('https://github.com/matplotlib/cheatsheets/')
-
-    return fig
+def docs():
+    return text_slide(DOCS)
 
 
 def slides():
     """
     Return slides for this section.
     """
-    return (
-        docs(),
-    )
+    yield docs
@@ -2,25 +2,32 @@
 End slide.
 """
 
-from mplslide import FONT, new_slide, slide_heading
+from mplslide import text_slide
 
 
-def slides():
+#: The contents of the end slide; see `mplslide.layout_text`.
+END = {
+    'heading': 'Thank You!',
+    'fontsize': 56,
+    'items': [
+        {'text': 'This entire presentation was made in Matplotlib:',
+         'x': 0.5, 'y': 0.5, 'va': 'baseline', 'ha': 'center'},
+        {'text': 'https://github.com/QuLogic/scipy2020-mpl-update',
+         'x': 0.5, 'y': 0.4, 'va': 'baseline', 'ha': 'center',
+         'url': 'https://github.com/QuLogic/scipy2020-mpl-update'},
+    ],
+}
+
+
+def end():
     """
     Create end slide.
     """
-    fig = new_slide()
-
-    slide_heading(fig, 'Thank You!')
-
-    props = dict(fontproperties=FONT, fontsize=56, alpha=0.7,
-                 horizontalalignment='center')
+    return text_slide(END)
 
-    fig.text(0.5, 0.5, 'This entire presentation was made in Matplotlib:',
-             **props)
 
-    t = fig.text(0.5, 0.4, '\nhttps://github.com/QuLogic/scipy2020-mpl-update',
-                 **props)
-    t.set_url('https://github.com/QuLogic/scipy2020-mpl-update')
-
-    return fig
+def slides():
+    """
+    Return slides for this section.
+    """
+    yield end
@@ -0,0 +1,152 @@
+"""
+Export slides to PNG, SVG and a static HTML viewer, for publishing on the web.
+
+Each slide is rasterized only once, at the highest requested resolution, and
+smaller PNG images are resampled from that. SVG files keep hyperlinks set on
+artists with ``set_url``, and the HTML viewer overlays them on the images.
+"""
+
+from html import escape
+import io
+from pathlib import Path
+
+from matplotlib.text import Text
+from PIL import Image
+
+
+#: The resolutions at which to export PNG images, from largest to smallest.
+PNG_DPIS = (100, 50, 20)
+
+
+class SlideExporter:
+    """
+    Export slides to PNG and SVG files in a directory.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path
+        The directory in which to write files.
+    dpis : list of float, default: `PNG_DPIS`
+        The resolutions at which to export PNG images.
+    svg : bool, default: True
+        Whether to export SVG files.
+    """
+
+    def __init__(self, directory, dpis=PNG_DPIS, svg=True):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dpis = sorted(dpis, reverse=True)
+        self.svg = svg
+
+    def save(self, fig, name):
+        """
+        Export a slide.
+
+        Parameters
+        ----------
+        fig : matplotlib.figure.Figure
+            The slide figure.
+        name : str
+            The base name of the exported files.
+
+        Returns
+        -------
+        dict
+            Information on the slide for `write_html`: its *name*, the *size*
+            (width, height) in inches, the *png* file names by resolution,
+            the *svg* file name, and its *links* as (url, bounds) pairs, with
+            bounds in figure coordinates from the top left.
+        """
+        info = {'name': name, 'size': tuple(fig.get_size_inches()),
+                'png': {}, 'svg': None, 'links': []}
+
+        # Draw once at the highest resolution, and resample for the rest.
+        buf = io.BytesIO()
+        fig.savefig(buf, format='rgba', dpi=self.dpis[0])
+        width, height = (fig.get_size_inches() * self.dpis[0]).round()
+        image = Image.frombuffer('RGBA', (int(width), int(height)),
+                                 buf.getbuffer(), 'raw', 'RGBA', 0, 1)
+        for dpi in self.dpis:
+            size = tuple(int(round(s * dpi)) for s in fig.get_size_inches())
+            resized = image if size == image.size else image.resize(
+                size, Image.Resampling.LANCZOS)
+            png = f'{name}-{dpi:g}dpi.png'
+            resized.save(self.directory / png)
+            info['png'][dpi] = png
+
+        # Text positions are known from the draw above.
+        inverse = fig.transFigure.inverted()
+        for text in fig.findobj(lambda artist: isinstance(artist, Text) and
+                                artist.get_url() and artist.get_visible()):
+            (x0, y0), (x1, y1) = inverse.transform(
+                text.get_window_extent().get_points())
+            info['links'].append((text.get_url(), (x0, 1 - y1, x1, 1 - y0)))
+
+        if self.svg:
+            svg = f'{name}.svg'
+            fig.savefig(self.directory / svg, format='svg',
+                        dpi=fig.mplslide_props['savefig_dpi'])
+            info['svg'] = svg
+
+        return info
+
+
+def write_html(path, slides, title):
+    """
+    Write a static HTML viewer for exported slides.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        The HTML file to write, in the same directory as the exported files.
+    slides : list of dict
+        The information on each slide, as returned by `SlideExporter.save`.
+    title : str
+        The title of the page.
+    """
+    parts = []
+    for number, slide in enumerate(slides, 1):
+        dpis = sorted(slide['png'], reverse=True)
+        width, _ = slide['size']
+        srcset = ', '.join(f'{escape(slide["png"][dpi])} {width * dpi:.0f}w'
+                           for dpi in dpis)
+        links = ''.join(
+            f'<a href="{escape(url)}" style="left: {x0:.2%}; top: {y0:.2%}; '
+            f'width: {x1 - x0:.2%}; height: {y1 - y0:.2%};"></a>'
+            for url, (x0, y0, x1, y1) in slide['links'])
+        svg = (f' <a href="{escape(slide["svg"])}">SVG</a>'
+               if slide['svg'] else '')
+        parts.append(f'''\
+<section id="{number}">
+<div class="slide">
+<img src="{escape(slide['png'][dpis[0]])}" srcset="{srcset}"
+     alt="Slide {number}" loading="lazy">
+{links}
+</div>
+<p><a href="#{number}">{number}</a>{svg}</p>
+</section>''')
+
+    Path(path).write_text(f'''\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{escape(title)}</title>
+<style>
+body {{ margin: 0; background: #444; font-family: sans-serif; }}
+html {{ scroll-snap-type: y mandatory; }}
+section {{ scroll-snap-align: start; padding: 1em; }}
+.slide {{ position: relative; max-width: 100%; width: 1920px;
+         margin: auto; }}
+.slide img {{ display: block; width: 100%; height: auto; }}
+.slide a {{ position: absolute; }}
+p {{ text-align: center; color: #ddd; }}
+p a {{ color: #ddd; }}
+</style>
+</head>
+<body>
+{chr(10).join(parts)}
+</body>
+</html>
+''', encoding='utf-8')
@@ -52,6 +52,4 @@ def slides():
     """
     Return slides for this section.
     """
-    return (
-        feature32_bar3d(),
-    )
+    yield feature32_bar3d
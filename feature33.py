@@ -2,14 +2,12 @@
 Feature highlights for Matplotlib 3.3.0.
 """
 
+from functools import partial
+
 import numpy as np
 import matplotlib.pyplot as plt
 
-from mplslide import new_slide, slide_heading, annotate_pr_author
-
-
-CODE = dict(fontfamily='monospace', fontsize=40, verticalalignment='top',
-            alpha=0.7)
+from mplslide import CODE, new_slide, slide_heading, annotate_pr_author
 
 
 def formatter():
@@ -77,9 +75,36 @@ def identify_axes(ax_dict):
         ax.text(0.5, 0.5, k, transform=ax.transAxes, **kw)
 
 
-def mosaic():
+def mosaic_example(text):
     """
     Create slide for feature highlight of subplot_mosaic.
+
+    Parameters
+    ----------
+    text : str
+        The mosaic layout to show, as Python source code.
+    """
+
+    fig = new_slide()
+
+    slide_heading(fig, '3.3 Feature: subplot_mosaic')
+
+    fig.text(0.05, 0.8, f'plt.figure().subplot_mosaic({text})', **CODE)
+
+    ax_dict = fig.subplot_mosaic(eval(text.lstrip()),
+                                 # Don't overlay title and code.
+                                 gridspec_kw={'left': 0.3, 'top': 0.7,
+                                              'right': 0.97})
+    identify_axes(ax_dict)
+
+    annotate_pr_author(fig, 'tacaswell', pr=16603)
+
+    return fig
+
+
+def mosaic():
+    """
+    Return slides for feature highlight of subplot_mosaic.
     """
 
     example1 = """
@@ -94,21 +119,7 @@ def mosaic():
 ]"""
 
     for text in [example1, example2]:
-        fig = new_slide()
-
-        slide_heading(fig, '3.3 Feature: subplot_mosaic')
-
-        fig.text(0.05, 0.8, f'plt.figure().subplot_mosaic({text})', **CODE)
-
-        ax_dict = fig.subplot_mosaic(eval(text.lstrip()),
-                                     # Don't overlay title and code.
-                                     gridspec_kw={'left': 0.3, 'top': 0.7,
-                                                  'right': 0.97})
-        identify_axes(ax_dict)
-
-        annotate_pr_author(fig, 'tacaswell', pr=16603)
-
-        yield fig
+        yield partial(mosaic_example, text)
 
 
 def sharing():
@@ -124,10 +135,11 @@ def sharing():
 axd['histx'].sharex(axd['scat'])
 axd['histy'].sharey(axd['scat'])""", **CODE)
 
-    np.random.seed(0)
-    x = np.random.random(100) * 100 + 20
-    y = np.random.random(100) * 50 + 25
-    c = np.random.random(100) - 0.5
+    # A local generator keeps the data the same wherever the slide is built.
+    rng = np.random.default_rng(0)
+    x = rng.random(100) * 100 + 20
+    y = rng.random(100) * 50 + 25
+    c = rng.random(100) - 0.5
 
     with plt.rc_context({'xtick.labelsize': 20, 'ytick.labelsize': 20}):
         axd = fig.subplot_mosaic([['.', 'histx'], ['histy', 'scat']],
@@ -164,9 +176,7 @@ def slides():
     """
     Return slides for this section.
     """
-    return (
-        formatter(),
-        axline(),
-        *mosaic(),
-        sharing(),
-    )
+    yield formatter
+    yield axline
+    yield from mosaic()
+    yield sharing
@@ -0,0 +1,163 @@
+"""
+Feature highlights generated from a changelog.
+
+Feature records are read from a CSV or JSON Lines file, one at a time, and
+each is rendered with a slide template, so that decks with hundreds of
+features can be built without holding them all in memory. Each record may
+have the fields:
+
+* *title*: The title of the feature, for the slide heading.
+* *version*: The version that added the feature, to prefix the heading.
+* *code*: A code snippet demonstrating the feature.
+* *description*: Text describing the feature, one item per line.
+* *pr*: The number of the Pull Request adding the feature.
+* *authors*: The GitHub usernames of its authors; in CSV files (or as a JSON
+  string), these are separated by commas.
+* *template*: The name of the template in `TEMPLATES` to use; by default,
+  ``code`` if there is a code snippet, and ``text`` otherwise.
+"""
+
+import csv
+from functools import partial
+import json
+import os
+from pathlib import Path
+
+from mplslide import (BULLET, CODE, annotate_pr_author, layout_text,
+                      new_slide, slide_heading)
+
+
+#: Slide templates, by name; each is a function creating a slide from a record.
+TEMPLATES = {}
+
+
+def template(name):
+    """
+    Register a function as a slide template in `TEMPLATES`.
+    """
+    def decorator(func):
+        TEMPLATES[name] = func
+        return func
+    return decorator
+
+
+def _heading(record):
+    if record.get('version'):
+        return f'{record["version"]} Feature: {record["title"]}'
+    return record['title']
+
+
+def _authors(authors):
+    # Authors may be given as a comma-separated string, as in CSV files.
+    if isinstance(authors, str):
+        authors = authors.split(',')
+    return [author.strip() for author in authors or [] if author.strip()]
+
+
+def _annotate(fig, record):
+    authors = _authors(record.get('authors'))
+    if authors:
+        pr = int(record['pr']) if record.get('pr') else None
+        annotate_pr_author(fig, *authors, pr=pr)
+
+
+@template('code')
+def code_feature(record):
+    """
+    Create a slide for a feature with a code snippet.
+
+    Parameters
+    ----------
+    record : dict
+        The feature record.
+    """
+
+    fig = new_slide()
+
+    slide_heading(fig, _heading(record))
+
+    fig.text(0.05, 0.8, record['code'], **CODE)
+
+    _annotate(fig, record)
+
+    return fig
+
+
+@template('text')
+def text_feature(record):
+    """
+    Create a slide for a feature with a list of descriptive text.
+
+    Parameters
+    ----------
+    record : dict
+        The feature record.
+    """
+
+    fig = new_slide()
+
+    slide_heading(fig, _heading(record))
+
+    items = [{'text': f'{BULLET} {line}'}
+             for line in record.get('description', '').splitlines() if line]
+    if items:
+        items[0]['y'] = 0.8
+    for kwargs in layout_text(items):
+        fig.text(**kwargs)
+
+    _annotate(fig, record)
+
+    return fig
+
+
+def read_records(path):
+    """
+    Read feature records from a file, one at a time.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        A CSV file with a header row, or a JSON Lines file (with a ``.jsonl``
+        extension) with one JSON object per line.
+
+    Yields
+    ------
+    dict
+        Each feature record.
+    """
+    path = Path(path)
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.suffix == '.jsonl':
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            for record in csv.DictReader(f):
+                record['authors'] = _authors(record.get('authors'))
+                yield record
+
+
+def cache_key(path):
+    """
+    Return data identifying the contents of a feature record file.
+
+    This is used by `slidecache` to invalidate the cached section when the
+    file changes.
+    """
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def slides(path):
+    """
+    Return slides for this section.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        The file of feature records; see `read_records`.
+    """
+    for record in read_records(path):
+        name = record.get('template') or ('code' if record.get('code')
+                                          else 'text')
+        yield partial(TEMPLATES[name], record)
@@ -3,63 +3,766 @@
 """
 Generate slides for the presentation.
 
-Usage: ./make.py /path/to/matplotlib/checkout
+Usage: ./make.py [-j JOBS] [--no-cache] [--watch] [--export DIR]
+                 [--profile PREFIX] [--only SECTION ...] [--features FILE]
+                 [--manifest FILE] [/path/to/matplotlib/checkout]
 
-You must make a clone of the Matplotlib git repository available, and should
-have the Carlito and/or Calibri font installed.
+You must make a clone of the Matplotlib git repository available to build the
+timeline, and should have the Carlito and/or Calibri font installed.
+
+Each section is rendered to its own PDF, which is cached in `.slidecache` so
+that unchanged sections need not be rendered again, and the results are
+merged in order into `slides.pdf`, and the optimized
+`scipy2020-mpl-update.pdf` in the same pass; this requires pikepdf or qpdf.
+`slides.pdf` is not optimized, so each section keeps its own font subsets and
+other resources; only `scipy2020-mpl-update.pdf` shares them between sections.
+With ``-j JOBS``, sections are rendered in a pool of worker processes. With
+``--no-cache``, or if neither pikepdf nor qpdf is available, all slides are
+rendered again.
+
+With ``--export DIR``, each slide is also exported to PNG at several
+resolutions and to SVG, with a static HTML viewer, in the given directory. This
+renders all sections, as only the PDF is cached.
+
+With ``--profile PREFIX``, the time taken to construct, draw and serialize each
+rendered slide, along with the bytes written and peak memory, are written to
+``PREFIX.json`` and ``PREFIX.csv``, and summarized by section.
+
+With ``--only SECTION``, only the given sections are built into `slides.pdf`,
+for previewing; the modules for other sections are not even imported. This may
+be repeated to select several sections.
+
+With ``--features FILE``, a section of feature highlights is generated from the
+records in a CSV or JSON Lines file (see `features`), after the hand-written
+feature highlights.
+
+With ``--manifest FILE``, several decks listed in a JSON file (see
+`read_manifest`) are built instead, each with its own sections and metadata.
+Sections shared between decks are only rendered once, and all sections are
+rendered in a single pool of workers; this requires pikepdf.
+
+If the ``SOURCE_DATE_EPOCH`` environment variable is set, the build is
+reproducible: it is used as the creation date, and file identifiers are derived
+from the contents, so that identical inputs produce byte-identical PDFs.
+
+With ``--watch``, the slides are built once, and then rebuilt whenever one of
+the slide modules changes, keeping Matplotlib and fonts loaded in between.
 """
 
-import shutil
-import subprocess
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+import importlib
+import json
+import os
+from pathlib import Path
 import sys
+import tempfile
+import time
+import traceback
 
+import matplotlib.pyplot as plt
 from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+# Functions are used through the module, so that `--watch` uses them as
+# reloaded. Other slide modules may only be imported once fonts are found, by
+# `main`.
+import mplslide
 
-from mplslide import check_requirements
-# This must be called before importing other files to make the font available.
-check_requirements()  # noqa: F402
 
-from title import create_icon_axes, slides as title_slides
-from news import slides as news_slides
-from timeline import slides as history_slides
-from feature32 import slides as feature32_slides
-from feature33 import slides as feature33_slides
-from docs import slides as docs_slides
-from plan import slides as plan_slides
-from end import slides as end_slides
+#: The modules that create each section of the presentation, in order. They are
+#: only imported when the section is built; see `load_section`.
+SECTIONS = ('title', 'news', 'timeline', 'feature32', 'feature33', 'features',
+            'docs', 'plan', 'end')
+#: The sections whose `slides` function requires arguments; they are left out
+#: of the presentation unless these are given (see `load_pages`).
+ARG_SECTIONS = ('timeline', 'features')
+
+
+def parse_args():
+    """
+    Parse command-line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description='Generate slides for the presentation.')
+    parser.add_argument('mpl_path', metavar='matplotlib-path', nargs='?',
+                        help='Path to a git checkout of Matplotlib, for the '
+                             'timeline.')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Number of worker processes to render sections '
+                             'with; 0 uses all CPUs. (default: %(default)s)')
+    parser.add_argument('--no-cache', dest='cache', action='store_false',
+                        help='Render all sections, ignoring any cached '
+                             'results.')
+    parser.add_argument('--export', metavar='DIR',
+                        help='Also export slides to PNG, SVG and HTML in this '
+                             'directory.')
+    parser.add_argument('--profile', metavar='PREFIX',
+                        help='Profile rendered slides, writing results to '
+                             'PREFIX.json and PREFIX.csv.')
+    parser.add_argument('--features', metavar='FILE',
+                        help='Generate feature highlights from the records in '
+                             'this CSV or JSON Lines file.')
+    parser.add_argument('--only', metavar='SECTION', action='append',
+                        choices=SECTIONS,
+                        help='Only build this section, for previewing; may be '
+                             'repeated. (choices: %(choices)s)')
+    parser.add_argument('--watch', action='store_true',
+                        help='Rebuild slides whenever a slide module changes.')
+    parser.add_argument('--manifest', metavar='FILE',
+                        help='Build all decks listed in this JSON file, '
+                             'instead of the presentation.')
+    args = parser.parse_args()
+    if args.manifest and (args.export or args.profile or args.features or
+                          args.only or args.watch):
+        parser.error('--manifest cannot be combined with --export, '
+                     '--profile, --features, --only or --watch')
+    if args.only and 'features' in args.only and not args.features:
+        parser.error('--only features requires --features')
+    if (args.mpl_path is None and not args.manifest and
+            (not args.only or 'timeline' in args.only)):
+        parser.error('matplotlib-path is required to build the timeline')
+    return args
 
 
 METADATA = {
     'Author': 'Elliott Sales de Andrade',
     'Title': 'Matplotlib Project Update for SciPy 2020',
 }
-MPL_PATH = sys.argv[1]
-PAGES = [
-    # Tuple of function + any arguments.
-    (title_slides, ),
-    (news_slides, ),
-    (history_slides, MPL_PATH, ),
-    (feature32_slides, ),
-    (feature33_slides, ),
-    (docs_slides, ),
-    (plan_slides, ),
-    (end_slides, ),
-]
-
-with PdfPages('slides.pdf', metadata=METADATA) as pdf:
-    for page, *args in PAGES:
-        figs = page(*args)
-        if not isinstance(figs, (tuple, list)):
-            figs = (figs, )
-        for fig in figs:
-            if not fig.mplslide_props['plain']:
-                create_icon_axes(fig, (0.825, 0.825, 0.2, 0.15),
-                                 0.3, 0.3, 0.3, [5])
-            pdf.savefig(fig)
-
-# Linearize the PDF if qpdf is available.
-if shutil.which('qpdf') is not None:
-    subprocess.run(['qpdf', 'slides.pdf', '--object-streams=generate',
-                    '--linearize', 'scipy2020-mpl-update.pdf'])
-else:
-    shutil.copy('slides.pdf', 'scipy2020-mpl-update.pdf')
+#: Whether to produce byte-identical output for identical inputs; see
+#: https://reproducible-builds.org/specs/source-date-epoch/
+REPRODUCIBLE = 'SOURCE_DATE_EPOCH' in os.environ
+if REPRODUCIBLE:
+    # Matplotlib already uses this date, but it must also be set on sections
+    # from the cache, which may have been rendered with another date.
+    METADATA['CreationDate'] = datetime.fromtimestamp(
+        int(os.environ['SOURCE_DATE_EPOCH']), timezone.utc)
+    # Otherwise, SVG element IDs are random.
+    plt.rcParams['svg.hashsalt'] = METADATA['Title']
+
+
+def load_section(name, section_args=None):
+    """
+    Import the module for a section, and return its entry, as in
+    `load_pages`.
+
+    Parameters
+    ----------
+    name : str
+        The name of the section, from `SECTIONS`.
+    section_args : dict, optional
+        Any arguments to pass to the `slides` function, by section name.
+    """
+    module = importlib.import_module(name)
+    return (module.slides, *(section_args or {}).get(name, ()))
+
+
+def load_pages(section_args=None, only=None):
+    """
+    Import the sections of the presentation, and return their entries.
+
+    Sections in `ARG_SECTIONS` are left out unless they are given arguments,
+    e.g., feature highlights are only generated if given records.
+
+    Parameters
+    ----------
+    section_args : dict, optional
+        Any arguments to pass to the `slides` function, by section name.
+    only : list of str, optional
+        The names of the sections to include; by default, all of `SECTIONS`.
+        The modules for other sections are not imported.
+
+    Returns
+    -------
+    list of tuple
+        The `slides` function of each section, followed by any arguments to
+        pass to it, in order.
+    """
+    section_args = section_args or {}
+    return [load_section(name, section_args) for name in SECTIONS
+            if (not only or name in only) and
+            (name not in ARG_SECTIONS or name in section_args)]
+
+
+def read_manifest(path, section_args=None):
+    """
+    Read a manifest of decks to build with `build_decks`.
+
+    The manifest is a JSON list of decks, each an object with keys:
+
+    * *output*: The path of the (optimized) PDF to write.
+    * *sections*: The names of the sections in the deck, from `SECTIONS`.
+    * *metadata*: Any document information to set, replacing that in
+      `METADATA`, e.g., a different *Title*.
+    * *args*: Any arguments to pass to sections, by section name, replacing
+      those in *section_args*, e.g., ``{"features": ["features.csv"]}``. They
+      must be given for any section in `ARG_SECTIONS`.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        The JSON file to read.
+    section_args : dict, optional
+        Any arguments to pass to the `slides` function, by section name, for
+        all decks, e.g., those given on the command line.
+
+    Returns
+    -------
+    list of dict
+        Each deck, with its *output*, *metadata*, and *pages* as from
+        `load_pages`.
+    """
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    decks = []
+    for deck in manifest:
+        unknown = set(deck['sections']) - set(SECTIONS)
+        if unknown:
+            raise ValueError(f'Unknown sections in deck {deck["output"]!r}: '
+                             f'{", ".join(sorted(unknown))}')
+        deck_args = {**(section_args or {}), **deck.get('args', {})}
+        needed = [name for name in deck['sections']
+                  if name in ARG_SECTIONS and name not in deck_args]
+        if needed:
+            raise ValueError(f'Sections in deck {deck["output"]!r} need '
+                             f'arguments, in its "args": '
+                             f'{", ".join(sorted(needed))}')
+        decks.append({
+            'output': deck['output'],
+            'metadata': {**METADATA, **deck.get('metadata', {})},
+            'pages': [load_section(name, deck_args)
+                      for name in deck['sections']],
+        })
+    return decks
+
+
+def _section_slides(page, *args):
+    """
+    Return the slide factories (or figures) of a section.
+
+    For compatibility, a section may return a single slide figure, instead of
+    an iterable of slide factories.
+    """
+    slides = page(*args)
+    if isinstance(slides, Figure):
+        slides = (slides, )
+    return slides
+
+
+def _create_slide(slide):
+    """
+    Create a slide figure from a factory (or figure), add decorations, and
+    apply its rasterization policy.
+    """
+    # Only imported once fonts are found.
+    import title
+
+    fig = slide() if callable(slide) else slide
+    if not fig.mplslide_props['plain']:
+        title.add_icon(fig)
+    mplslide.rasterize_heavy_artists(fig)
+    return fig
+
+
+def render_section(pdf, page, *args, exporter=None, section=0, output=None):
+    """
+    Render all slides of a single section into an open PDF.
+
+    Slides are created, saved and released one at a time, so that only one
+    slide figure is in use, and the figure can be reused for the next slide
+    (see `mplslide.release_slide`).
+
+    Parameters
+    ----------
+    pdf : matplotlib.backends.backend_pdf.PdfPages
+        The PDF to append the slides to.
+    page : callable
+        The section function, returning an iterable of slide factories (i.e.,
+        functions that create a slide figure). For compatibility, it may also
+        return a slide figure or a sequence of them.
+    *args
+        Any arguments to pass to *page*.
+    exporter : export.SlideExporter, optional
+        An exporter to also save each slide with, to other formats.
+    section : int, default: 0
+        The index of the section, used to name exported files.
+    output : file-like, optional
+        The file that *pdf* is writing to. If given, each slide is profiled.
+
+    Returns
+    -------
+    list of dict
+        A record for each slide, containing the information on the exported
+        slide as *export* (from `.SlideExporter.save`), and the profile of the
+        slide as *profile* (from `.profiling.measure_slide`), or None.
+    """
+    def save(fig):
+        pdf.savefig(fig, dpi=fig.mplslide_props['savefig_dpi'])
+        if exporter is not None:
+            record['export'] = exporter.save(
+                fig, f'slide-{section:02d}-{i:02d}')
+
+    records = []
+    for i, slide in enumerate(_section_slides(page, *args)):
+        record = {'export': None, 'profile': None}
+        if output is None:
+            fig = _create_slide(slide)
+            save(fig)
+        else:
+            import profiling
+
+            fig, record['profile'] = profiling.measure_slide(
+                page.__module__, i, partial(_create_slide, slide), save,
+                output)
+        mplslide.release_slide(fig)
+        records.append(record)
+    return records
+
+
+def _prefetcher(page):
+    """
+    Return the `prefetch` function of a section's module, or None.
+
+    Sections may define ``prefetch(*args)``, taking the same arguments as
+    ``slides``, to do slow I/O (e.g., running git) ahead of rendering, so that
+    it overlaps with rendering other sections.
+    """
+    return getattr(sys.modules[page.__module__], 'prefetch', None)
+
+
+def start_prefetch(pool, sections):
+    """
+    Start prefetching data for sections in a thread pool.
+
+    Parameters
+    ----------
+    pool : concurrent.futures.ThreadPoolExecutor
+        The pool in which to run `prefetch` functions.
+    sections : list of (int, callable, *args)
+        The sections to prefetch, as their index and entry from `load_pages`.
+
+    Returns
+    -------
+    dict
+        Futures of the prefetches, by section index, for `render_sections`.
+    """
+    return {i: pool.submit(_prefetcher(page), *args)
+            for i, page, *args in sections if _prefetcher(page) is not None}
+
+
+def render_sections(path, sections, exporter=None, profile=False,
+                    prefetched=None, metadata=None):
+    """
+    Render the slides of several sections into a new PDF file.
+
+    The file is written atomically, so that a partial result never appears in
+    the cache. If the sections have no slides, no file is written (and any
+    existing file is removed), as an empty PDF cannot be merged. This is run in
+    worker processes for parallel builds.
+
+    Parameters
+    ----------
+    path : str
+        The path of the PDF to write.
+    sections : list of (int, callable, *args)
+        The sections to render, as their index and entry from `load_pages`.
+    exporter : export.SlideExporter, optional
+        An exporter to also save each slide with, to other formats.
+    profile : bool, default: False
+        Whether to profile each slide.
+    prefetched : dict, optional
+        Futures by section index, as from `start_prefetch`, to wait for before
+        rendering each section.
+    metadata : dict, optional
+        Document information for the PDF, as for ``PdfPages``.
+
+    Returns
+    -------
+    list of dict
+        A record for each slide, as from `render_section`, plus a profile of
+        finalizing the file if *profile* is True.
+    """
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    records = []
+    try:
+        with open(tmp_path, 'wb') as fh:
+            with PdfPages(fh, metadata=metadata) as pdf:
+                for i, page, *args in sections:
+                    if prefetched and i in prefetched:
+                        prefetched[i].result()
+                    records += render_section(pdf, page, *args,
+                                              exporter=exporter, section=i,
+                                              output=fh if profile else None)
+                pages = pdf.get_pagecount()
+                if profile:
+                    import profiling
+
+                    # Shared resources are written for all sections at once.
+                    name = (sections[0][1].__module__ if len(sections) == 1
+                            else '(all)')
+                    records.append({'export': None,
+                                    'profile': profiling.measure_finalize(
+                                        name, pdf.close, fh)})
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    if pages:
+        os.replace(tmp_path, path)
+    else:
+        os.remove(tmp_path)
+        Path(path).unlink(missing_ok=True)
+    return records
+
+
+def render_missing(missing, jobs=1, exporter=None, profile=False,
+                   metadata=None):
+    """
+    Render sections, each to its own PDF file.
+
+    Parameters
+    ----------
+    missing : list of (int, str, callable, *args)
+        The sections to render, as their index, the path of the PDF to write,
+        and their entry from `load_pages`.
+    jobs : int, default: 1
+        The number of worker processes to use; if 1, render in this process.
+    exporter : export.SlideExporter, optional
+        An exporter to also save each slide with, to other formats.
+    profile : bool, default: False
+        Whether to profile each slide.
+    metadata : dict, optional
+        Document information for each PDF, as for ``PdfPages``.
+
+    Returns
+    -------
+    list of dict
+        A record for each slide, as from `render_sections`, in the order of
+        *missing*.
+    """
+    records = []
+    if jobs == 1 or len(missing) <= 1:
+        with ThreadPoolExecutor(max_workers=1) as io_pool:
+            prefetched = [start_prefetch(io_pool, [(i, *entry)])
+                          for i, _, *entry in missing]
+            for (i, path, *entry), ready in zip(missing, prefetched):
+                records += render_sections(path, [(i, *entry)], exporter,
+                                           profile, ready, metadata)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs or None) as pool:
+            # Start sections that need no prefetching, and prefetch for the
+            # rest in this process while they render. This avoids starting
+            # threads that worker processes would be forked from.
+            futures = [None] * len(missing)
+            waiting = []
+            for n, (i, path, page, *args) in enumerate(missing):
+                if _prefetcher(page) is None:
+                    futures[n] = pool.submit(render_sections, path,
+                                             [(i, page, *args)], exporter,
+                                             profile, None, metadata)
+                else:
+                    waiting.append(n)
+            for n in waiting:
+                i, path, page, *args = missing[n]
+                _prefetcher(page)(*args)
+                futures[n] = pool.submit(render_sections, path,
+                                         [(i, page, *args)], exporter,
+                                         profile, None, metadata)
+            for future in futures:
+                records += future.result()
+    return records
+
+
+def build(pages, output, jobs=1, cache=None, exporter=None, profile=False,
+          optimized=None):
+    """
+    Render all slides of some sections into *output*.
+
+    Parameters
+    ----------
+    pages : list of tuple
+        The sections to render, as from `load_pages`.
+    output : str
+        The path of the PDF to write.
+    jobs : int, default: 1
+        The number of worker processes to use; if 1, render in this process.
+    cache : slidecache.SlideCache, optional
+        The cache from which to take unchanged sections.
+    exporter : export.SlideExporter, optional
+        An exporter to also save each slide with, to other formats. All
+        sections are then rendered, though the *cache* is still updated.
+    profile : bool, default: False
+        Whether to profile each rendered slide. Sections taken from the
+        *cache* are not profiled.
+    optimized : str, optional
+        The path to also write an optimized PDF to; see `pdftools.optimize`.
+
+    Returns
+    -------
+    list of dict
+        A record for each rendered slide, as from `render_sections`.
+    """
+    if not pages:
+        sys.exit('No sections to build.')
+    # Sections are rendered to separate files and merged when possible, so
+    # that the optimized PDF is written while merging, instead of reading the
+    # whole output back in. This also makes reproducible builds the same
+    # whether or not sections were cached or rendered in parallel.
+    merge = (jobs != 1 or cache is not None or optimized is not None or
+             REPRODUCIBLE)
+    if merge:
+        # Only load pikepdf when it is needed.
+        import pdftools
+
+        if not pdftools.available():
+            if jobs != 1:
+                sys.exit('Parallel builds require pikepdf or qpdf to be '
+                         'installed.')
+            merge = False
+    if not merge:
+        sections = [(i, *entry) for i, entry in enumerate(pages)]
+        with ThreadPoolExecutor(max_workers=1) as io_pool:
+            records = render_sections(output, sections, exporter, profile,
+                                      start_prefetch(io_pool, sections),
+                                      METADATA)
+        if not os.path.exists(output):
+            sys.exit('No slides were built.')
+        if optimized is not None:
+            pdftools.optimize(output, optimized, deterministic=REPRODUCIBLE)
+        return records
+
+    # Metadata is set when merging, if possible, so that it does not affect
+    # the cached sections.
+    section_metadata = None if pdftools.can_set_metadata() else METADATA
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        missing = []
+        for i, (page, *args) in enumerate(pages):
+            if cache is None:
+                path = os.path.join(tmpdir, f'{i:04d}.pdf')
+            else:
+                key = cache.key(page, *args, extra=section_metadata)
+                path = cache.path(key)
+                if exporter is None and cache.hit(key):
+                    paths.append(path)
+                    continue
+            paths.append(path)
+            missing.append((i, path, page, *args))
+
+        records = render_missing(missing, jobs, exporter, profile,
+                                 section_metadata)
+        # Sections without slides have no file.
+        paths = [path for path in paths if os.path.exists(path)]
+        if not paths:
+            sys.exit('No slides were built.')
+
+        pdftools.merge(paths, output, deterministic=REPRODUCIBLE,
+                       optimized=optimized,
+                       metadata=METADATA if section_metadata is None else None)
+
+    if cache is not None:
+        cache.evict()
+    return records
+
+
+def build_decks(decks, jobs=1, cache=None):
+    """
+    Render several decks, rendering the sections they share only once.
+
+    All sections missing from the *cache* are rendered in one pool of
+    workers, and then each deck is merged from them.
+
+    Parameters
+    ----------
+    decks : list of dict
+        The decks to build, as from `read_manifest`.
+    jobs : int, default: 1
+        The number of worker processes to use; if 1, render in this process.
+    cache : slidecache.SlideCache, optional
+        The cache from which to take unchanged sections.
+    """
+    import pdftools
+    from slidecache import SlideCache
+
+    if not pdftools.can_set_metadata():
+        sys.exit('Building several decks requires pikepdf to be installed.')
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Without a cache, sections are still shared between decks through a
+        # temporary one.
+        store = cache if cache is not None else SlideCache(tmpdir)
+        deck_paths = []
+        missing = {}
+        for deck in decks:
+            paths = []
+            for i, (page, *args) in enumerate(deck['pages']):
+                key = store.key(page, *args)
+                paths.append(store.path(key))
+                if key not in missing and not store.hit(key):
+                    missing[key] = (i, store.path(key), page, *args)
+            deck_paths.append(paths)
+
+        render_missing(list(missing.values()), jobs)
+
+        for n, (deck, paths) in enumerate(zip(decks, deck_paths)):
+            # Sections without slides have no file.
+            paths = [path for path in paths if os.path.exists(path)]
+            if not paths:
+                sys.exit(f'No slides were built for {deck["output"]}.')
+            pdftools.merge(paths, os.path.join(tmpdir, f'deck-{n:04d}.pdf'),
+                           deterministic=REPRODUCIBLE,
+                           optimized=deck['output'],
+                           metadata=deck['metadata'])
+
+    if cache is not None:
+        cache.evict()
+
+
+def _source_mtime(name):
+    """
+    Return the modification time of the source of an imported module.
+    """
+    try:
+        return os.stat(sys.modules[name].__file__).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def reload_modules(pages, names):
+    """
+    Reload slide modules, and update *pages* to use the reloaded functions.
+
+    If any common module (used by all slides) is changed, then all slide
+    modules are reloaded, as they may import names from it.
+    """
+    from slidecache import COMMON_MODULES
+
+    names = set(names)
+    if names & set(COMMON_MODULES):
+        names |= {page.__module__ for page, *_ in pages}
+    # Common modules must be reloaded first, in dependency order.
+    ordered = [name for name in COMMON_MODULES if name in names]
+    ordered += sorted(names - set(COMMON_MODULES))
+    for name in ordered:
+        importlib.reload(sys.modules[name])
+        if name == 'mplslide':
+            mplslide.check_requirements(checkout=False)
+    pages[:] = [(getattr(sys.modules[page.__module__], page.__name__), *args)
+                for page, *args in pages]
+
+
+def watch(pages, output, jobs=1, cache=None, interval=0.1):
+    """
+    Rebuild *output* whenever the source of a slide module changes.
+
+    Only changed modules are reloaded, and with a *cache*, only the sections
+    they produce are rendered again.
+
+    Parameters
+    ----------
+    pages : list of tuple
+        The sections to render, as from `load_pages`; they are updated to use
+        reloaded modules.
+    output : str
+        The path of the PDF to write.
+    jobs : int, default: 1
+        The number of worker processes to use; if 1, render in this process.
+    cache : slidecache.SlideCache, optional
+        The cache from which to take unchanged sections.
+    interval : float, default: 0.1
+        The time to wait between checking for changes, in seconds.
+    """
+    from slidecache import COMMON_MODULES
+
+    names = {page.__module__ for page, *_ in pages} | set(COMMON_MODULES)
+    mtimes = {name: _source_mtime(name) for name in names}
+    print('Watching for changes; press Ctrl+C to stop.')
+    while True:
+        time.sleep(interval)
+        changed = []
+        for name in names:
+            mtime = _source_mtime(name)
+            if mtime != mtimes[name]:
+                mtimes[name] = mtime
+                changed.append(name)
+        if not changed:
+            continue
+
+        start = time.perf_counter()
+        try:
+            reload_modules(pages, changed)
+            build(pages, output, jobs, cache)
+        except Exception:
+            # Keep watching, so that mistakes can be fixed in place.
+            traceback.print_exc()
+        else:
+            elapsed = time.perf_counter() - start
+            print(f'Rebuilt {output} after changes to {", ".join(changed)} '
+                  f'in {elapsed:.2f}s.')
+        finally:
+            # Nothing else will close these in a long-running process.
+            plt.close('all')
+
+
+def main():
+    """
+    Build the presentation, or the decks of a manifest, as given on the
+    command line.
+    """
+    args = parse_args()
+    # This must be called before importing slide modules to make the font
+    # available.
+    start = time.perf_counter()
+    mplslide.check_requirements(checkout=False)
+    font_time = time.perf_counter() - start
+    # The source of this common module is also used for cache keys and
+    # watched, even if only worker processes draw slides.
+    import title  # noqa: F401
+
+    section_args = {}
+    if args.mpl_path is not None:
+        section_args['timeline'] = (args.mpl_path, )
+    if args.features:
+        section_args['features'] = (args.features, )
+    # Optional features are only imported when used, as they import optional
+    # dependencies and slow down starting quick preview builds.
+    cache = None
+    if args.cache:
+        from slidecache import SlideCache
+        cache = SlideCache()
+    if args.manifest:
+        build_decks(read_manifest(args.manifest, section_args), args.jobs,
+                    cache)
+        return
+    pages = load_pages(section_args, args.only)
+    exporter = None
+    if args.export:
+        from export import SlideExporter, write_html
+        exporter = SlideExporter(args.export)
+    # Shrink and linearize the final PDF if pikepdf or qpdf is available, but
+    # don't replace it with a partial preview.
+    optimized = (None if args.only or args.watch
+                 else 'scipy2020-mpl-update.pdf')
+    records = build(pages, 'slides.pdf', args.jobs, cache, exporter,
+                    profile=bool(args.profile), optimized=optimized)
+    if exporter is not None:
+        write_html(exporter.directory / 'index.html',
+                   [record['export'] for record in records
+                    if record['export'] is not None],
+                   METADATA['Title'])
+    if args.profile:
+        import profiling
+        profiling.write_report([record['profile'] for record in records],
+                               args.profile, font_time=font_time)
+
+    if args.watch:
+        plt.close('all')
+        try:
+            watch(pages, 'slides.pdf', args.jobs, cache)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
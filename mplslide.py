@@ -2,10 +2,23 @@
 Common functions for working with slides.
 """
 
+from functools import lru_cache
+import hashlib
+import json
+import os
+from pathlib import Path
 import sys
 
+import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
+import matplotlib.collections as mcollections
+import matplotlib.colors as mcolors
 import matplotlib.font_manager
+import matplotlib.lines as mlines
+from matplotlib.font_manager import get_font
+from matplotlib.path import Path as MPLPath
+from matplotlib.textpath import TextPath, text_to_path
 
 
 #: The blue used for Matplotlib logo.
@@ -20,25 +33,108 @@ FONT = None
 FIGSIZE = (19.2, 10.8)
 #: The DPI of a slide figure.
 DPI = 100
+#: The number of elements (e.g., markers, polygons or line vertices) above
+#: which an artist is rasterized in vector output.
+RASTER_THRESHOLD = 5000
+#: The resolution at which to rasterize artists in vector output.
+RASTER_DPI = 200
+#: The text properties to use for code snippets.
+CODE = dict(fontfamily='monospace', fontsize=40, verticalalignment='top',
+            alpha=0.7)
+#: The file in which to store resolved font paths between runs.
+FONT_CACHE = Path(matplotlib.get_cachedir(), 'mplslide-fonts.json')
+#: The maximum number of text paths to keep in the cache.
+TEXT_PATH_CACHE_SIZE = 64
+#: The horizontal position of each level of a list, in figure coordinates.
+LIST_INDENT = {1: 0.05, 2: 0.1}
+#: The maximum number of released slide figures to keep for reuse.
+FIGURE_POOL_SIZE = 4
+#: Released slide figures, for reuse by `new_slide`.
+_figure_pool = []
+#: The directory in which to store decoded images and reduced copies of assets.
+ASSET_CACHE = Path(matplotlib.get_cachedir(), 'mplslide-assets')
+#: The approximate number of bytes of an asset to process at once when reducing
+#: it.
+ASSET_CHUNK_SIZE = 64 * 1024**2
 
 
-def check_requirements():
+def _font_files_key():
+    """
+    Return data identifying the font files known to Matplotlib.
+    """
+    manager = matplotlib.font_manager.fontManager
+    digest = hashlib.sha256()
+    for fname in sorted(font.fname
+                        for font in manager.ttflist + manager.afmlist):
+        digest.update(fname.encode('utf-8', 'surrogateescape') + b'\0')
+    return [matplotlib.__version__, digest.hexdigest()]
+
+
+def find_fonts(*patterns):
+    """
+    Find the font files that best match some font patterns.
+
+    This is the same as calling `matplotlib.font_manager.findfont` on each
+    pattern, but results are stored in `FONT_CACHE`, and re-used until the
+    installed fonts or Matplotlib version change.
+
+    Parameters
+    ----------
+    *patterns : str
+        Fontconfig patterns, e.g., ``Carlito:bold``.
+
+    Returns
+    -------
+    list of str
+        The path of the font file for each pattern.
+    """
+    key = _font_files_key()
+    try:
+        cache = json.loads(FONT_CACHE.read_text())
+    except (OSError, ValueError):
+        cache = {}
+    fonts = cache.get('fonts', {}) if cache.get('key') == key else {}
+
+    result = []
+    for pattern in patterns:
+        path = fonts.get(pattern)
+        if path is None or not Path(path).exists():
+            path = fonts[pattern] = \
+                matplotlib.font_manager.findfont(pattern)
+        result.append(path)
+
+    if cache.get('key') != key or cache.get('fonts') != fonts:
+        try:
+            FONT_CACHE.write_text(json.dumps({'key': key, 'fonts': fonts}))
+        except OSError:
+            pass  # The cache directory may be read-only; just don't save.
+    return result
+
+
+def check_requirements(checkout=True):
     """
     Check requirements to create the slides.
 
     Currently checks whether the path to a Matplotlib repository is specified,
     and that the Carlito and/or Calibri fonts are available.
+
+    Parameters
+    ----------
+    checkout : bool, default: True
+        Whether the path to a Matplotlib repository is required on the
+        command line.
     """
 
-    if len(sys.argv) < 2:
+    if checkout and len(sys.argv) < 2:
         sys.exit('Usage: %s <matplotlib-path>' % (sys.argv[0], ))
     # The original font is Calibri, if that is not installed, we fall back
     # to Carlito, which is metrically equivalent.
     calibri = carlito = None
-    if 'Calibri' in matplotlib.font_manager.findfont('Calibri:bold'):
+    calibri_path, carlito_path = find_fonts('Calibri:bold', 'Carlito:bold')
+    if 'Calibri' in calibri_path:
         calibri = matplotlib.font_manager.FontProperties(family='Calibri',
                                                          weight='bold')
-    if 'Carlito' in matplotlib.font_manager.findfont('Carlito:bold'):
+    if 'Carlito' in carlito_path:
         carlito = matplotlib.font_manager.FontProperties(family='Carlito',
                                                          weight='bold')
     global FONT, LOGO_FONT
@@ -60,7 +156,137 @@ def check_requirements():
         sys.exit('Calibri or Carlito font must be installed.')
 
 
-def new_slide(plain=False):
+@lru_cache(maxsize=TEXT_PATH_CACHE_SIZE)
+def text_path(text, size, prop):
+    """
+    Return the outline of some text, as a path.
+
+    Paths are cached, so that glyphs for the same text need only be laid out
+    once. The least-recently used paths are dropped when there are more than
+    `TEXT_PATH_CACHE_SIZE`.
+
+    Parameters
+    ----------
+    text : str
+        The text to convert to a path.
+    size : float
+        The font size, in points.
+    prop : matplotlib.font_manager.FontProperties
+        The font to use; it must not be modified after this call.
+
+    Returns
+    -------
+    matplotlib.path.Path
+        The read-only path of the text, starting at (0, 0).
+    """
+    path = TextPath((0, 0), text, size=size, prop=prop)
+    return MPLPath(path.vertices, path.codes, readonly=True)
+
+
+@lru_cache()
+def line_metrics(prop):
+    """
+    Return the ascent, descent and line gap of a font, in points.
+
+    These are the typographic metrics of the font, from its OS/2 or hhea
+    table, falling back to the extents of "lp" if neither is available. They
+    are measured once per font and size, without a renderer.
+
+    Parameters
+    ----------
+    prop : matplotlib.font_manager.FontProperties
+        The font, including its size; it must not be modified after this call.
+    """
+    font = get_font(matplotlib.font_manager.findfont(prop))
+    size = prop.get_size_in_points()
+    for table_name, ascent_key, descent_key, gap_key in [
+            ('OS/2', 'sTypoAscender', 'sTypoDescender', 'sTypoLineGap'),
+            ('hhea', 'ascent', 'descent', 'lineGap')]:
+        table = font.get_sfnt_table(table_name)
+        if table is not None:
+            scale = size / font.get_sfnt_table('head')['unitsPerEm']
+            return (table[ascent_key] * scale, -table[descent_key] * scale,
+                    table[gap_key] * scale)
+    _, height, descent = text_to_path.get_text_width_height_descent(
+        'lp', prop, ismath=False)
+    return height - descent, descent, 0
+
+
+def layout_text(items, fontsize=48, alpha=0.7):
+    """
+    Compile a declarative list of text items into positioned lines.
+
+    Each line is positioned at its baseline when compiled, using the metrics
+    of its font from `line_metrics`, instead of being laid out when drawn.
+    Successive lines are spaced by the ascent, descent and line gap of the
+    font. Empty lines are only used for spacing, and do not create any text.
+
+    Each line is still a separate text artist, whose extent Matplotlib measures
+    when drawn. A multi-line text artist would instead be spaced by
+    Matplotlib's own line spacing, which differs between versions, so items are
+    not combined into one artist.
+
+    Parameters
+    ----------
+    items : list of dict
+        The text items, each with the following keys:
+
+        - *text*: The text, which may contain multiple lines.
+        - *y*: The vertical position of the top of the item, in figure
+          coordinates. If not given, the item continues on the line after
+          the previous item; the first item must give it.
+        - *va*: If ``'baseline'``, *y* is the baseline of the first line,
+          instead of its top.
+        - *level*: The indentation level, from `LIST_INDENT`; default 1.
+        - *x*: The horizontal position, in figure coordinates, instead of
+          *level*.
+        - *ha*: The horizontal alignment; default ``'left'``.
+        - *weight*: The font weight, instead of that of `FONT`.
+        - *url*: A link for the text.
+    fontsize : float, default: 48
+        The font size of all items.
+    alpha : float, default: 0.7
+        The transparency of all items.
+
+    Returns
+    -------
+    list of dict
+        The keyword arguments to `matplotlib.figure.Figure.text` for each line.
+    """
+    fig_height = FIGSIZE[1] * 72
+    lines = []
+    top = line = None
+    for item in items:
+        prop = FONT.copy()
+        prop.set_size(fontsize)
+        if 'weight' in item:
+            prop.set_weight(item['weight'])
+        ascent, descent, line_gap = line_metrics(prop)
+        pitch = ascent + descent + line_gap
+
+        if 'y' in item:
+            top = item['y'] * fig_height
+            if item.get('va', 'top') == 'top':
+                top -= ascent
+            line = 0
+        elif line is None:
+            raise ValueError('The first text item must have a y position')
+        x = item.get('x', LIST_INDENT[item.get('level', 1)])
+
+        for text in item['text'].split('\n'):
+            if text:
+                lines.append({
+                    'x': x, 'y': (top - line * pitch) / fig_height, 's': text,
+                    'fontproperties': prop, 'alpha': alpha,
+                    'horizontalalignment': item.get('ha', 'left'),
+                    'verticalalignment': 'baseline', 'url': item.get('url'),
+                })
+            line += 1
+    return lines
+
+
+def new_slide(plain=False, raster_threshold=RASTER_THRESHOLD,
+              raster_dpi=RASTER_DPI):
     """
     Create a new slide.
 
@@ -68,13 +294,118 @@ def new_slide(plain=False):
     ----------
     plain : bool, default: False
         Whether to leave out any slide decorations (e.g., logo).
+    raster_threshold : int or None, default: `RASTER_THRESHOLD`
+        The number of elements above which collections and lines are
+        rasterized in vector output, by `rasterize_heavy_artists`; if None,
+        nothing is rasterized automatically.
+    raster_dpi : float, default: `RASTER_DPI`
+        The resolution at which to rasterize those artists.
     """
 
-    fig = plt.figure(figsize=FIGSIZE, dpi=DPI)
-    fig.mplslide_props = {'plain': plain}
+    fig = None
+    while _figure_pool and fig is None:
+        fig = _figure_pool.pop()
+        if not plt.fignum_exists(fig.number):
+            fig = None  # Closed since it was released, e.g., by plt.close.
+    if fig is None:
+        fig = plt.figure(figsize=FIGSIZE, dpi=DPI)
+    else:
+        _reset_figure(fig)
+        plt.figure(fig)  # Make it the current figure, as for a new one.
+    fig.mplslide_props = {'plain': plain, 'raster_threshold': raster_threshold,
+                          'raster_dpi': raster_dpi, 'savefig_dpi': None}
     return fig
 
 
+def _reset_figure(fig):
+    """
+    Reset a cleared figure to the settings `new_slide` creates it with.
+    """
+    rc = matplotlib.rcParams
+    fig.set_dpi(DPI)
+    fig.set_size_inches(FIGSIZE)
+    fig.set_layout_engine(None)
+    fig.subplotpars.update(**{
+        name: rc[f'figure.subplot.{name}']
+        for name in ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')})
+    fig.patch.set(visible=True, facecolor=rc['figure.facecolor'],
+                  edgecolor=rc['figure.edgecolor'], linewidth=0)
+
+
+def release_slide(fig):
+    """
+    Release a slide that has been saved, so its figure may be reused.
+
+    Its artists are removed right away, and other settings are reset when
+    `new_slide` hands it out again, which is faster than creating a new
+    figure. Up to `FIGURE_POOL_SIZE` figures are kept; any others, and figures
+    not created by `new_slide`, are closed instead. Callbacks connected to the
+    figure's canvas are not removed, so slides should not connect any.
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        The slide figure, which must not be used afterwards.
+    """
+    if (len(_figure_pool) >= FIGURE_POOL_SIZE or fig in _figure_pool or
+            not hasattr(fig, 'mplslide_props')):
+        plt.close(fig)
+        return
+    fig.clear()
+    del fig.mplslide_props
+    _figure_pool.append(fig)
+
+
+def _artist_size(artist):
+    """
+    Return the number of elements drawn by a collection or line.
+    """
+    if isinstance(artist, mlines.Line2D):
+        return len(artist.get_xydata())
+    if isinstance(artist, mcollections.QuadMesh):
+        rows, cols = artist.get_coordinates().shape[:2]
+        return (rows - 1) * (cols - 1)
+    return max(len(artist.get_paths()), len(artist.get_offsets()))
+
+
+def rasterize_heavy_artists(fig):
+    """
+    Rasterize the collections and lines of a slide with many elements.
+
+    This keeps vector output small and fast to display, while text (including
+    headings and links) stays as vectors. The policy is set per slide by
+    `new_slide`; individual artists may also be rasterized with
+    `~.Artist.set_rasterized` as usual.
+
+    If anything is rasterized, the slide's *raster_dpi* is recorded as its
+    *savefig_dpi* property, to pass as *dpi* when saving vector output, as
+    vector backends rasterize at the resolution they are saved with. The
+    resolution of the figure itself is not changed.
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        The slide figure.
+
+    Returns
+    -------
+    int
+        The number of artists that were rasterized.
+    """
+    threshold = fig.mplslide_props.get('raster_threshold')
+    if threshold is None:
+        return 0
+    count = 0
+    for artist in fig.findobj(lambda artist: isinstance(
+            artist, (mcollections.Collection, mlines.Line2D))):
+        if not artist.get_rasterized() and _artist_size(artist) > threshold:
+            artist.set_rasterized(True)
+            count += 1
+    if count:
+        fig.mplslide_props['savefig_dpi'] = fig.mplslide_props['raster_dpi']
+    return count
+
+
 def slide_heading(fig, text):
     """
     Add a heading to a slide, using a common style.
@@ -90,6 +421,29 @@ def slide_heading(fig, text):
     fig.text(0.05, 0.85, text, color='C0', fontproperties=FONT, fontsize=72)
 
 
+def text_slide(spec):
+    """
+    Create a slide of text from a declarative spec.
+
+    Parameters
+    ----------
+    spec : dict
+        The slide, with its *heading* text, and *items* of text as described
+        in `layout_text`. Optionally, the *fontsize* and *alpha* of the items
+        may be given.
+    """
+
+    fig = new_slide()
+
+    slide_heading(fig, spec['heading'])
+
+    for kwargs in layout_text(spec['items'], fontsize=spec.get('fontsize', 48),
+                              alpha=spec.get('alpha', 0.7)):
+        fig.text(**kwargs)
+
+    return fig
+
+
 def annotate_pr_author(fig, *authors, pr=None):
     """
     Annotate the Pull Request author(s) on the bottom-right corner of a slide.
@@ -110,3 +464,543 @@ def annotate_pr_author(fig, *authors, pr=None):
                  horizontalalignment='right')
     if pr is not None:
         t.set_url(f'https://github.com/matplotlib/matplotlib/pull/{pr}')
+
+
+#: The faces of a unit bar, as in `~.Axes3D.bar3d`: -z, +z, -y, +y, -x, +x.
+#: Vertices are in counterclockwise order when viewed from outside.
+_BAR_FACES = np.array([
+    [(0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0)],
+    [(0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)],
+    [(0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1)],
+    [(0, 1, 0), (0, 1, 1), (1, 1, 1), (1, 1, 0)],
+    [(0, 0, 0), (0, 0, 1), (0, 1, 1), (0, 1, 0)],
+    [(1, 0, 0), (1, 1, 0), (1, 1, 1), (1, 0, 1)],
+])
+#: The outward normal of each face in `_BAR_FACES`.
+_BAR_NORMALS = np.array([
+    (0, 0, -1), (0, 0, 1), (0, -1, 0), (0, 1, 0), (-1, 0, 0), (1, 0, 0),
+])
+
+
+def _face_shading(normals, lightsource=None):
+    """
+    Return the factor by which to shade faces with the given normals.
+
+    This matches the shading of `~.Axes3D.bar3d` with ``shade=True``.
+    """
+    if lightsource is None:
+        # The default of Axes3D.
+        lightsource = mcolors.LightSource(azdeg=225, altdeg=19.4712)
+    shade = ((normals / np.linalg.norm(normals, axis=-1, keepdims=True))
+             @ lightsource.direction)
+    # Map from [-1, 1] to [0.3, 1].
+    return 0.3 + 0.7 * (shade + 1) / 2
+
+
+def shaded_bar3d(ax, heights, color, lightsource=None, x0=0, y0=0, dx=1,
+                 dy=1, z0=0, **kwargs):
+    """
+    Plot a grid of touching, shaded 3D bars as a single collection.
+
+    This looks the same as `~.Axes3D.bar3d` with ``shade=True``, but is faster
+    for large grids: the shading is computed once for each of the six face
+    directions, and the parts of side faces that are hidden inside neighbouring
+    bars are left out, instead of being projected, sorted and drawn.
+
+    Parameters
+    ----------
+    ax : mpl_toolkits.mplot3d.axes3d.Axes3D
+        The Axes to draw into.
+    heights : (M, N) array-like
+        The non-negative height of each bar, with rows along y and columns
+        along x.
+    color : color or list of colors
+        A single color for all bars, a list of M * N colors (in the order of
+        ``heights.ravel()``), or an (M, N, 3 or 4) array of colors.
+    lightsource : matplotlib.colors.LightSource, optional
+        The light source to shade the bars with; the default is the same as
+        for `~.Axes3D.bar3d`.
+    x0, y0 : float, default: 0
+        The position of the corner of the first bar.
+    dx, dy : float, default: 1
+        The width and depth of every bar, which is also the grid spacing.
+    z0 : float, default: 0
+        The base of all bars.
+    **kwargs
+        Any additional keyword arguments are passed on to
+        `~.art3d.Poly3DCollection`.
+
+    Returns
+    -------
+    mpl_toolkits.mplot3d.art3d.Poly3DCollection
+        The faces of all the bars.
+    """
+    # Only load 3D support when it is needed.
+    from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+
+    heights = np.asarray(heights, dtype=float)
+    rows, cols = heights.shape
+    if np.ndim(color) == 3:
+        color = np.reshape(color, (-1, np.shape(color)[-1]))
+    colors = np.broadcast_to(mcolors.to_rgba_array(color),
+                             (rows * cols, 4)).reshape(rows, cols, 4)
+
+    # The vertical extent of each face: bottom, top, then sides, which are
+    # only visible above the neighbouring bar (or base, at the edges).
+    top = z0 + heights
+    padded = np.pad(top, 1, constant_values=z0)
+    neighbours = [padded[:-2, 1:-1], padded[2:, 1:-1],
+                  padded[1:-1, :-2], padded[1:-1, 2:]]
+    zlo = np.stack([np.full_like(top, z0), top, *neighbours])
+    zhi = np.stack([np.full_like(top, z0), top, top, top, top, top])
+    visible = np.ones(zlo.shape, dtype=bool)
+    visible[2:] = zhi[2:] > zlo[2:]
+
+    # Indexed by [face, row, column, vertex, coordinate].
+    faces = _BAR_FACES[:, np.newaxis, np.newaxis]
+    polys = np.empty(zlo.shape + _BAR_FACES.shape[1:])
+    polys[..., 0] = x0 + (np.arange(cols)[:, np.newaxis] +
+                          faces[..., 0]) * dx
+    polys[..., 1] = y0 + (np.arange(rows)[:, np.newaxis, np.newaxis] +
+                          faces[..., 1]) * dy
+    polys[..., 2] = (zlo[..., np.newaxis] +
+                     faces[..., 2] * (zhi - zlo)[..., np.newaxis])
+
+    shade = _face_shading(_BAR_NORMALS, lightsource)
+    facecolors = colors * shade[:, np.newaxis, np.newaxis, np.newaxis]
+    facecolors[..., 3] = colors[..., 3]
+
+    had_data = ax.has_data()
+    collection = Poly3DCollection(polys[visible],
+                                  facecolors=facecolors[visible], **kwargs)
+    ax.add_collection3d(collection)
+    ax.auto_scale_xyz((x0, x0 + cols * dx), (y0, y0 + rows * dy),
+                      (z0, max(z0, top.max(initial=z0))), had_data)
+    return collection
+
+
+def _asset_path(path, *params):
+    """
+    Return the path in `ASSET_CACHE` for data derived from a file.
+
+    The name is a hash of the file's path, size and modification time, and any
+    *params* used to derive the data, so that it changes with the file.
+    """
+    stat = os.stat(path)
+    key = repr((os.path.realpath(path), stat.st_size, stat.st_mtime_ns,
+                params))
+    return ASSET_CACHE / f'{hashlib.sha256(key.encode()).hexdigest()}.npy'
+
+
+def _save_asset(cached, shape, dtype, fill):
+    """
+    Write an array to *cached* with ``fill(out)``, and memory-map the result.
+
+    The array is written through a memory map, so that it need not fit in
+    memory, and atomically, so that an interrupted build leaves no partial
+    file.
+    """
+    ASSET_CACHE.mkdir(parents=True, exist_ok=True)
+    tmp_path = cached.with_name(f'{cached.stem}.{os.getpid()}.tmp')
+    out = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=dtype,
+                                    shape=shape)
+    fill(out)
+    out.flush()
+    del out
+    os.replace(tmp_path, cached)
+    return np.load(cached, mmap_mode='r')
+
+
+def _block_mean(array, factors, out):
+    """
+    Average blocks of *factors* elements of the first two axes of *array* into
+    *out*, a band of rows at a time.
+    """
+    rows = np.arange(0, array.shape[0], factors[0])
+    cols = np.arange(0, array.shape[1], factors[1])
+    col_counts = np.diff(cols, append=array.shape[1])
+    col_counts = col_counts.reshape(-1, *[1] * (array.ndim - 2))
+    band = max(1, ASSET_CHUNK_SIZE // (array[0].size * 8 * factors[0]))
+    for start in range(0, len(rows), band):
+        starts = rows[start:start + band]
+        stop = rows[start + band] if start + band < len(rows) else len(array)
+        block = np.asarray(array[starts[0]:stop], dtype=float)
+        sums = np.add.reduceat(np.add.reduceat(block, starts - starts[0]),
+                               cols, axis=1)
+        row_counts = np.diff(starts, append=stop)
+        mean = sums / row_counts.reshape(-1, 1, *[1] * (array.ndim - 2))
+        mean /= col_counts
+        if np.issubdtype(out.dtype, np.integer):
+            mean = np.rint(mean)
+        out[start:start + band] = mean
+
+
+def _reduced(path, array, max_shape, params=()):
+    """
+    Return *array*, loaded from *path*, reduced to at most *max_shape*.
+
+    Reduced arrays are cached by the factor they are reduced by, which is the
+    same for all targets with a similar resolution.
+    """
+    if array.ndim < 2:
+        raise ValueError('Only arrays with at least 2 dimensions can be '
+                         'reduced')
+    factors = tuple(max(1, -(-size // limit))
+                    for size, limit in zip(array.shape, max_shape))
+    if factors == (1, 1):
+        return array
+    cached = _asset_path(path, 'reduced', factors, *params)
+    try:
+        return np.load(cached, mmap_mode='r')
+    except FileNotFoundError:
+        pass
+    shape = (*(-(-size // factor)
+               for size, factor in zip(array.shape, factors)),
+             *array.shape[2:])
+    return _save_asset(cached, shape, array.dtype,
+                       lambda out: _block_mean(array, factors, out))
+
+
+def axes_pixels(ax, dpi=None):
+    """
+    Return the size of an Axes on its slide, in pixels.
+
+    This is the most data that can be seen in the Axes, e.g., for the
+    *max_shape* of `load_array` and `load_image`.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        The Axes.
+    dpi : float, optional
+        The resolution; by default, the slide's *raster_dpi* (see
+        `new_slide`), at which it may be rasterized in vector output.
+
+    Returns
+    -------
+    (int, int)
+        The number of rows and columns of pixels.
+    """
+    fig = ax.figure
+    if dpi is None:
+        dpi = fig.mplslide_props['raster_dpi']
+    width, height = fig.get_size_inches()
+    position = ax.get_position()
+    return (max(1, round(position.height * height * dpi)),
+            max(1, round(position.width * width * dpi)))
+
+
+def load_array(path, dtype=None, shape=None, offset=0, max_shape=None):
+    """
+    Load an array from a file, memory-mapped instead of read into memory.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        A ``.npy`` file, or a file of raw binary data.
+    dtype : data-type, optional
+        The data type of a raw file; required for raw files, and ignored for
+        ``.npy`` files.
+    shape : tuple of int, optional
+        The shape of a raw file; by default, it is 1D.
+    offset : int, default: 0
+        The offset of the data in a raw file, in bytes.
+    max_shape : (int, int), optional
+        The maximum size of the first two axes, e.g., from `axes_pixels`.
+        Larger arrays are reduced by averaging blocks, a band of rows at a
+        time, and the result is cached in `ASSET_CACHE`, so later builds only
+        read the reduced data.
+
+    Returns
+    -------
+    numpy.ndarray
+        A read-only, memory-mapped array.
+    """
+    if Path(path).suffix == '.npy':
+        array = np.load(path, mmap_mode='r')
+    elif dtype is None:
+        raise ValueError('A dtype must be given to load a raw file')
+    else:
+        array = np.memmap(path, dtype=dtype, mode='r', shape=shape,
+                          offset=offset)
+    if max_shape is None:
+        return array
+    return _reduced(path, array, max_shape,
+                    (np.dtype(dtype).str if dtype else None, shape, offset))
+
+
+def load_image(path, max_shape=None):
+    """
+    Load an image, memory-mapped instead of read into memory.
+
+    Images in ``.npy`` files, with shape (rows, columns) or (rows, columns,
+    channels), are mapped directly. Other formats are decoded once with
+    Pillow, and the pixels are stored in `ASSET_CACHE` to be mapped by later
+    builds.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        The image file.
+    max_shape : (int, int), optional
+        The maximum number of rows and columns of pixels, e.g., from
+        `axes_pixels`; see `load_array`.
+
+    Returns
+    -------
+    numpy.ndarray
+        A read-only, memory-mapped array of pixels.
+    """
+    if Path(path).suffix == '.npy':
+        return load_array(path, max_shape=max_shape)
+    decoded = _asset_path(path, 'decoded')
+    try:
+        array = np.load(decoded, mmap_mode='r')
+    except FileNotFoundError:
+        # Only load Pillow when an image needs decoding.
+        from PIL import Image
+
+        with Image.open(path) as image:
+            if image.mode == 'P':
+                # Palette indices cannot be averaged.
+                image = image.convert('RGBA')
+            pixels = np.asarray(image)
+
+        def fill(out):
+            out[...] = pixels
+
+        array = _save_asset(decoded, pixels.shape, pixels.dtype, fill)
+        del pixels
+    if max_shape is None:
+        return array
+    return _reduced(path, array, max_shape, ('decoded', ))
+
+
+def _chunk_size(*arrays):
+    """
+    Return the number of elements of *arrays* to process at once.
+
+    Elements are counted as at least 8 bytes, as they are usually converted to
+    float.
+    """
+    itemsize = sum(max(8, np.asarray(array[:0]).itemsize)
+                   for array in arrays)
+    return max(1, ASSET_CHUNK_SIZE // itemsize)
+
+
+def _minmax_indices(y, bounds):
+    """
+    Return the sorted indices of the first, last, smallest and largest values
+    of *y* between each pair of consecutive *bounds*.
+    """
+    low, high = bounds[0], bounds[-1]
+    values = np.asarray(y[low:high])
+    starts = bounds[:-1] - low
+    ends = bounds[1:] - low
+    nonempty = starts < ends
+    starts, ends = starts[nonempty], ends[nonempty]
+    if not len(starts):
+        return np.empty(0, dtype=np.intp)
+    found = [starts, ends - 1]
+    for reduce in (np.fmin, np.fmax):
+        extreme = np.repeat(reduce.reduceat(values, starts), ends - starts)
+        hits = np.flatnonzero(values == extreme)
+        if not len(hits):
+            continue  # All NaN.
+        index = hits[np.minimum(np.searchsorted(hits, starts), len(hits) - 1)]
+        found.append(np.where((index >= starts) & (index < ends), index,
+                              starts))
+    return np.unique(np.concatenate(found)) + low
+
+
+def minmax_decimate(x, y, bins, xlim=None):
+    """
+    Reduce a line to the points that are visible at a horizontal resolution.
+
+    The x range is split into *bins* equal columns, and in each, only the
+    first, last, smallest and largest points are kept, in their original
+    order. Drawn at that resolution, the line looks the same, but has at most
+    four points per column.
+
+    Data is read a chunk of columns at a time, so *x* and *y* may be
+    memory-mapped arrays (see `load_array`) larger than memory.
+
+    Parameters
+    ----------
+    x, y : array-like
+        The coordinates of the line; *x* must be sorted in ascending order.
+    bins : int
+        The number of columns, e.g., the width of the Axes in pixels, from
+        `axes_pixels`.
+    xlim : (float, float), optional
+        The visible range of x; by default, that of the data. The nearest
+        point outside each side is also kept, so that the line still reaches
+        the edges.
+
+    Returns
+    -------
+    x, y : numpy.ndarray
+        The coordinates of the reduced line.
+    """
+    x = np.asanyarray(x)
+    y = np.asanyarray(y)
+    if not len(x):
+        return np.asarray(x), np.asarray(y)
+    if xlim is None:
+        xlim = (x[0], x[-1])
+    edges = np.linspace(*xlim, bins + 1)
+    # Indices into the (sorted) data at the edge of each column.
+    bounds = np.searchsorted(x, edges)
+    bounds[-1] = np.searchsorted(x, edges[-1], side='right')
+
+    keep = []
+    if bounds[0] > 0:
+        keep.append([bounds[0] - 1])
+    chunk = _chunk_size(x, y)
+    first = 0
+    while first < bins:
+        last = np.searchsorted(bounds, bounds[first] + chunk, side='right') - 1
+        last = min(max(last, first + 1), bins)
+        keep.append(_minmax_indices(y, bounds[first:last + 1]))
+        first = last
+    if bounds[-1] < len(x):
+        keep.append([bounds[-1]])
+    index = np.concatenate(keep).astype(np.intp)
+    return np.asarray(x[index]), np.asarray(y[index])
+
+
+def _bin_indices(values, low, high, count):
+    """
+    Return the index of the bin of each value, with *count* equal bins from
+    *low* to *high*, or -1 for values outside them.
+    """
+    values = np.asarray(values, dtype=float)
+    inside = (values >= low) & (values <= high)
+    scale = count / (high - low) if high > low else 0
+    scaled = np.where(inside, (values - low) * scale, -1)
+    # The last bin includes its right edge.
+    return np.minimum(scaled.astype(np.intp), count - 1)
+
+
+def _limits(values, limits=None):
+    """
+    Return the range of bins for *values*, as `numpy.histogram` does.
+
+    This is *limits* if given, or else the minimum and maximum of finite
+    *values*, reading them in chunks, or (0, 1) if there are none. An empty
+    range is widened by 0.5 on each side.
+    """
+    if limits is None:
+        low, high = np.inf, -np.inf
+        chunk = _chunk_size(values)
+        for start in range(0, len(values), chunk):
+            part = np.asarray(values[start:start + chunk], dtype=float)
+            part = part[np.isfinite(part)]
+            if len(part):
+                low, high = min(low, part.min()), max(high, part.max())
+        if low > high:
+            low, high = 0, 1
+    else:
+        low, high = limits
+        if not (np.isfinite(low) and np.isfinite(high)):
+            raise ValueError(f'Range ({low}, {high}) is not finite')
+        if low > high:
+            raise ValueError(f'Range ({low}, {high}) is reversed')
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    return float(low), float(high)
+
+
+def density_grid(x, y, shape, extent=None, weights=None):
+    """
+    Count the points of a scatter plot in each pixel of a grid.
+
+    Drawing the result with `~.Axes.imshow` shows where points are dense with
+    a single image, however many points there are. Data is read a chunk at a
+    time, so *x* and *y* may be memory-mapped arrays (see `load_array`).
+
+    Parameters
+    ----------
+    x, y : array-like
+        The coordinates of the points.
+    shape : (int, int)
+        The number of rows and columns of the grid, e.g., from `axes_pixels`.
+    extent : (float, float, float, float), optional
+        The range (left, right, bottom, top) of the grid; by default, that of
+        the data. Points outside it are ignored. Empty ranges are widened as
+        in `histogram`.
+    weights : array-like, optional
+        A weight for each point, to sum instead of counting points.
+
+    Returns
+    -------
+    grid : numpy.ndarray
+        The count (or sum of weights) in each pixel, with the first row at the
+        bottom, as for ``imshow(..., origin='lower')``.
+    extent : tuple of float
+        The range of the grid, as for ``imshow``.
+    """
+    rows, cols = shape
+    xlim = ylim = None
+    if extent is not None:
+        xlim, ylim = extent[:2], extent[2:]
+    extent = (*_limits(x, xlim), *_limits(y, ylim))
+    left, right, bottom, top = extent
+    grid = np.zeros(rows * cols)
+    chunk = (_chunk_size(x, y) if weights is None
+             else _chunk_size(x, y, weights))
+    for start in range(0, len(x), chunk):
+        part = slice(start, start + chunk)
+        ix = _bin_indices(x[part], left, right, cols)
+        iy = _bin_indices(y[part], bottom, top, rows)
+        inside = (ix >= 0) & (iy >= 0)
+        grid += np.bincount(
+            (iy * cols + ix)[inside],
+            None if weights is None else np.asarray(weights[part])[inside],
+            minlength=rows * cols)
+    return grid.reshape(rows, cols), extent
+
+
+def histogram(values, bins, bin_range=None, weights=None):
+    """
+    Compute a histogram of equal bins, reading data a chunk at a time.
+
+    This gives the same result as `numpy.histogram`, but *values* may be a
+    memory-mapped array (see `load_array`) larger than memory. Draw the result
+    with ``ax.stairs(counts, edges)``, rather than passing all values to
+    `~.Axes.hist`.
+
+    Parameters
+    ----------
+    values : array-like
+        The data.
+    bins : int
+        The number of bins, e.g., the width of the Axes in pixels, from
+        `axes_pixels`, or fewer.
+    bin_range : (float, float), optional
+        The range of the bins; by default, that of the data. As for
+        `numpy.histogram`, this is (0, 1) if there is no data, and an empty
+        range is widened by 0.5 on each side.
+    weights : array-like, optional
+        A weight for each value, to sum instead of counting values.
+
+    Returns
+    -------
+    counts : numpy.ndarray
+        The count (or sum of weights) in each bin.
+    edges : numpy.ndarray
+        The edges of the bins.
+    """
+    low, high = _limits(values, bin_range)
+    counts = np.zeros(bins)
+    chunk = (_chunk_size(values) if weights is None
+             else _chunk_size(values, weights))
+    for start in range(0, len(values), chunk):
+        part = slice(start, start + chunk)
+        index = _bin_indices(values[part], low, high, bins)
+        inside = index >= 0
+        counts += np.bincount(
+            index[inside],
+            None if weights is None else np.asarray(weights[part])[inside],
+            minlength=bins)
+    return counts, np.linspace(low, high, bins + 1)
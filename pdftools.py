@@ -0,0 +1,380 @@
+"""
+Helpers for post-processing PDF files.
+
+These use pikepdf if it is installed, and otherwise fall back to the `qpdf`
+command-line tool, if it is available.
+"""
+
+from contextlib import ExitStack
+from datetime import datetime, timezone
+import hashlib
+import re
+import shutil
+import subprocess
+
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
+
+def available():
+    """
+    Return whether any PDF post-processing tool is available.
+    """
+    return pikepdf is not None or shutil.which('qpdf') is not None
+
+
+#: The qpdf options to optimize a file; see `optimize`.
+_OPTIMIZE_FLAGS = ('--object-streams=generate', '--linearize')
+
+
+def can_set_metadata():
+    """
+    Return whether `merge` can set the document information of its output.
+    """
+    return pikepdf is not None
+
+
+def _set_metadata(pdf, metadata):
+    """
+    Set the document information of an open PDF, as for ``PdfPages``.
+    """
+    for key, value in metadata.items():
+        if isinstance(value, datetime):
+            value = value.astimezone(timezone.utc).strftime('D:%Y%m%d%H%M%SZ')
+        pdf.docinfo[pikepdf.Name(f'/{key}')] = value
+
+
+def _deterministic_flags(deterministic):
+    return ['--deterministic-id'] if deterministic else []
+
+
+def merge(inputs, output, deterministic=False, optimized=None,
+          metadata=None):
+    """
+    Concatenate PDF files, in order, into a single file.
+
+    The document information (e.g., title and author) of the first input is
+    kept for the output, updated with any given *metadata*.
+
+    Parameters
+    ----------
+    inputs : list of str or pathlib.Path
+        The PDF files to concatenate.
+    output : str or pathlib.Path
+        The path to write the merged PDF to.
+    deterministic : bool, default: False
+        Whether to derive the file identifier from the contents, instead of
+        generating a random one, so that identical inputs produce identical
+        output.
+    optimized : str or pathlib.Path, optional
+        A path to also write the merged PDF to, optimized as by `optimize`.
+        This is done while the inputs are open, so that the merged file need
+        not be read back in.
+    metadata : dict, optional
+        Document information to set on the output, with the same keys and
+        values as for ``PdfPages``. This requires pikepdf; see
+        `can_set_metadata`. Unless given, *CreationDate* is set to the current
+        time, as inputs may have been created (e.g., cached) earlier.
+    """
+
+    if not inputs:
+        raise ValueError('No PDF files to merge.')
+    if pikepdf is not None:
+        # Page contents are copied lazily, so all inputs must remain open until
+        # the output is saved.
+        with ExitStack() as stack:
+            pdf = stack.enter_context(pikepdf.open(inputs[0]))
+            for path in inputs[1:]:
+                other = stack.enter_context(pikepdf.open(path))
+                pdf.pages.extend(other.pages)
+            if metadata:
+                _set_metadata(pdf, {'CreationDate': datetime.now(timezone.utc),
+                                    **metadata})
+            pdf.save(output, deterministic_id=deterministic)
+            if optimized is not None:
+                _save_optimized(pdf, optimized, deterministic)
+    elif metadata:
+        raise RuntimeError('Setting metadata while merging requires pikepdf.')
+    elif shutil.which('qpdf') is not None:
+        subprocess.run(['qpdf', *_deterministic_flags(deterministic),
+                        inputs[0], '--pages', *inputs, '--', output],
+                       check=True)
+        if optimized is not None:
+            # qpdf can merge and optimize at once, reading only the inputs.
+            subprocess.run(['qpdf', *_deterministic_flags(deterministic),
+                            *_OPTIMIZE_FLAGS, inputs[0], '--pages', *inputs,
+                            '--', optimized], check=True)
+    else:
+        raise RuntimeError('Merging PDF files requires pikepdf or qpdf.')
+
+
+#: The resource categories whose entries may be de-duplicated by content.
+_SHARED_RESOURCES = ('/XObject', '/ExtGState', '/Pattern', '/Shading', '/Font')
+
+
+def _content_key(obj, memo):
+    """
+    Return a hashable key describing the content of a PDF object.
+
+    Indirect references are followed, so that identical objects that were
+    written separately (e.g., into different section files) have equal keys.
+    """
+    if isinstance(obj, pikepdf.Object) and obj.is_indirect:
+        objgen = obj.objgen
+        if objgen not in memo:
+            memo[objgen] = None  # Guard against reference cycles.
+            memo[objgen] = _direct_content_key(obj, memo)
+        return memo[objgen]
+    return _direct_content_key(obj, memo)
+
+
+def _direct_content_key(obj, memo):
+    if isinstance(obj, pikepdf.Stream):
+        data = hashlib.sha256(obj.read_raw_bytes()).digest()
+        return ('stream', _dict_key(obj, memo), data)
+    elif isinstance(obj, pikepdf.Dictionary):
+        return ('dict', _dict_key(obj, memo))
+    elif isinstance(obj, pikepdf.Array):
+        return ('array', tuple(_content_key(item, memo) for item in obj))
+    elif isinstance(obj, pikepdf.String):
+        return ('string', bytes(obj))
+    else:
+        return (type(obj).__name__, repr(obj))
+
+
+def _dict_key(obj, memo):
+    return tuple(sorted((key, _content_key(value, memo))
+                        for key, value in obj.items()
+                        # Lengths depend on the file the stream came from.
+                        if key != '/Length'))
+
+
+def _read_to_unicode(font):
+    """
+    Return the character code to Unicode mapping of a font.
+
+    The mapping is parsed from the font's ToUnicode CMap, as hexadecimal
+    strings of UTF-16BE.
+    """
+    if '/ToUnicode' not in font:
+        return {}
+    data = font.ToUnicode.read_bytes().decode('latin-1')
+    hexstr = r'<([0-9A-Fa-f]+)>'
+    mapping = {}
+    for section in re.findall('beginbfchar(.*?)endbfchar', data, re.S):
+        for src, dst in re.findall(fr'{hexstr}\s*{hexstr}', section):
+            mapping[int(src, 16)] = dst.upper()
+    for section in re.findall('beginbfrange(.*?)endbfrange', data, re.S):
+        for lo, hi, dst in re.findall(
+                fr'{hexstr}\s*{hexstr}\s*(\[[^]]*\]|<[0-9A-Fa-f]+>)', section):
+            codes = range(int(lo, 16), int(hi, 16) + 1)
+            if dst.startswith('['):
+                dsts = re.findall(hexstr, dst)
+            else:
+                start = int(dst[1:-1], 16)
+                dsts = ['%0*X' % (len(dst) - 2, start + i)
+                        for i in range(len(codes))]
+            mapping.update(zip(codes, (d.upper() for d in dsts)))
+    return mapping
+
+
+def _write_to_unicode(mapping):
+    """
+    Return a ToUnicode CMap for a character code to Unicode mapping.
+    """
+    lines = [
+        '/CIDInit /ProcSet findresource begin',
+        '12 dict begin',
+        'begincmap',
+        '/CIDSystemInfo',
+        '<< /Registry (Adobe)',
+        '   /Ordering (UCS)',
+        '   /Supplement 0',
+        '>> def',
+        '/CMapName /Adobe-Identity-UCS def',
+        '/CMapType 2 def',
+        '1 begincodespacerange',
+        '<00> <ff>',
+        'endcodespacerange',
+    ]
+    items = sorted(mapping.items())
+    # At most 100 entries are allowed per block.
+    for i in range(0, len(items), 100):
+        block = items[i:i + 100]
+        lines.append(f'{len(block)} beginbfchar')
+        lines.extend(f'<{code:02x}> <{dst}>' for code, dst in block)
+        lines.append('endbfchar')
+    lines += [
+        'endcmap',
+        'CMapName currentdict /CMap defineresource pop',
+        'end',
+        'end',
+    ]
+    return '\n'.join(lines).encode('ascii')
+
+
+def _type3_glyphs(font):
+    """
+    Return the glyph names and widths of a Type 3 font by character code.
+    """
+    glyphs = {}
+    code = 0
+    for item in font.Encoding.Differences:
+        if isinstance(item, int):
+            code = item
+        else:
+            glyphs[code] = str(item)
+            code += 1
+    first = int(font.FirstChar)
+    widths = list(font.Widths)
+    return {code: (name, widths[code - first] if first <= code else None)
+            for code, name in glyphs.items()}
+
+
+def _merge_type3(pdf, target, font):
+    """
+    Merge the glyphs of the Type 3 font *font* into *target*, if compatible.
+
+    Both fonts must belong to *pdf*.
+
+    Fonts are compatible if they come from the same font file, and no
+    character code maps to different glyphs in each.
+
+    Returns
+    -------
+    bool
+        Whether the fonts were merged.
+    """
+    for key in ('/FontMatrix', '/FontBBox'):
+        if list(target[key]) != list(font[key]):
+            return False
+    target_glyphs = _type3_glyphs(target)
+    glyphs = _type3_glyphs(font)
+    if any(target_glyphs.get(code, glyph) != glyph
+           for code, glyph in glyphs.items()):
+        return False
+
+    target_glyphs.update(glyphs)
+    codes = sorted(target_glyphs)
+    differences = []
+    previous = None
+    for code in codes:
+        if previous is None or code != previous + 1:
+            differences.append(code)
+        differences.append(pikepdf.Name(target_glyphs[code][0]))
+        previous = code
+    target.Encoding.Differences = pikepdf.Array(differences)
+    target.FirstChar = codes[0]
+    target.LastChar = codes[-1]
+    widths = [0] * (codes[-1] - codes[0] + 1)
+    for code, (_, width) in target_glyphs.items():
+        widths[code - codes[0]] = width or 0
+    target.Widths = pikepdf.Array(widths)
+    for name, proc in font.CharProcs.items():
+        if name not in target.CharProcs:
+            target.CharProcs[name] = proc
+
+    to_unicode = _read_to_unicode(target)
+    to_unicode.update(_read_to_unicode(font))
+    if to_unicode:
+        target.ToUnicode = pdf.make_stream(_write_to_unicode(to_unicode))
+
+    # The subset tag must identify the new set of glyphs.
+    digest = hashlib.sha256(' '.join(sorted(target.CharProcs.keys())).encode())
+    tag = ''.join(chr(ord('A') + b % 26) for b in digest.digest()[:6])
+    target.BaseFont = target.Name = target.FontDescriptor.FontName = \
+        pikepdf.Name(f'/{tag}+{_font_family(target)}')
+    return True
+
+
+def _font_family(font):
+    """
+    Return the name of a font without any subset tag.
+    """
+    name = str(font.get('/BaseFont', ''))
+    _, _, family = name.rpartition('+')
+    return family.lstrip('/')
+
+
+def _share_resources(pdf):
+    """
+    De-duplicate page resources with identical content, and merge subsets of
+    the same Type 3 font, across all pages of *pdf*.
+    """
+    canonical = {}
+    type3_fonts = {}
+    memo = {}
+    seen = set()
+    for page in pdf.pages:
+        resources = page.obj.get('/Resources')
+        if resources is None:
+            continue
+        if resources.is_indirect:
+            if resources.objgen in seen:
+                continue
+            seen.add(resources.objgen)
+        for category in _SHARED_RESOURCES:
+            entries = resources.get(category)
+            if entries is None:
+                continue
+            for name, obj in list(entries.items()):
+                if not obj.is_indirect:
+                    continue
+                if category == '/Font' and obj.get('/Subtype') == '/Type3':
+                    candidates = type3_fonts.setdefault(_font_family(obj), [])
+                    for target in candidates:
+                        if target.objgen == obj.objgen:
+                            break
+                        if _merge_type3(pdf, target, obj):
+                            entries[name] = target
+                            break
+                    else:
+                        candidates.append(obj)
+                else:
+                    key = (category, _content_key(obj, memo))
+                    entries[name] = canonical.setdefault(key, obj)
+
+
+def _save_optimized(pdf, output, deterministic=False):
+    """
+    Save an open PDF optimized with pikepdf; see `optimize`.
+
+    This modifies the resources of *pdf*.
+    """
+    _share_resources(pdf)
+    pdf.save(output, linearize=True, compress_streams=True,
+             object_stream_mode=pikepdf.ObjectStreamMode.generate,
+             deterministic_id=deterministic)
+
+
+def optimize(input, output, deterministic=False):
+    """
+    Optimize a PDF file for size and for viewing over slow connections.
+
+    With pikepdf, identical images, forms and other resources are stored once
+    across all pages, Type 3 font subsets of the same font are merged, objects
+    are compressed into object streams, and the file is linearized. Otherwise,
+    if `qpdf` is available, the file is only compressed and linearized. If
+    neither is available, the file is copied as-is.
+
+    Parameters
+    ----------
+    input : str or pathlib.Path
+        The PDF file to optimize.
+    output : str or pathlib.Path
+        The path to write the optimized PDF to.
+    deterministic : bool, default: False
+        Whether to derive the file identifier from the contents, as for
+        `merge`.
+    """
+
+    if pikepdf is not None:
+        with pikepdf.open(input) as pdf:
+            _save_optimized(pdf, output, deterministic)
+    elif shutil.which('qpdf') is not None:
+        subprocess.run(['qpdf', *_deterministic_flags(deterministic),
+                        *_OPTIMIZE_FLAGS, input, output], check=True)
+    else:
+        shutil.copy(input, output)
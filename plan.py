@@ -2,31 +2,37 @@
 Future plans.
 """
 
-from mplslide import BULLET, FONT, new_slide, slide_heading
+from mplslide import BULLET, text_slide
 
 
-def slides():
-    """
-    Create slide for future plans.
-    """
-    fig = new_slide()
+#: The contents of the future plans slide; see `mplslide.layout_text`.
+PLAN = {
+    'heading': 'Future Plans',
+    'fontsize': 56,
+    'items': [
+        {'text': 'Next feature release: 3.4', 'y': 0.8},
+        {'text': f'{BULLET} September 2020', 'y': 0.7, 'level': 2},
+        {'text': f'{BULLET} Dropping support for Python 3.6 & NumPy 1.15',
+         'y': 0.6, 'level': 2},
 
-    slide_heading(fig, 'Future Plans')
+        {'text': 'Google Season of Docs 2020', 'y': 0.4},
 
-    props = dict(fontproperties=FONT, fontsize=56, alpha=0.7,
-                 verticalalignment='top')
+        {'text': 'Check out our blog!', 'y': 0.2},
+        {'text': 'https://matplotlib.org/matplotblog/', 'level': 2,
+         'url': 'https://matplotlib.org/matplotblog/'},
+    ],
+}
 
-    fig.text(0.05, 0.8, 'Next feature release: 3.4', **props)
-    fig.text(0.1, 0.7, f'{BULLET} September 2020', **props)
-    fig.text(0.1, 0.6,
-             f'{BULLET} Dropping support for Python 3.6 & NumPy 1.15',
-             **props)
 
-    fig.text(0.05, 0.4, 'Google Season of Docs 2020', **props)
+def plan():
+    """
+    Create slide for future plans.
+    """
+    return text_slide(PLAN)
 
-    fig.text(0.05, 0.2, 'Check out our blog!', **props)
-    t = fig.text(0.1, 0.2, '\nhttps://matplotlib.org/matplotblog/',
-                 **props)
-    t.set_url('https://matplotlib.org/matplotblog/')
 
-    return fig
+def slides():
+    """
+    Return slides for this section.
+    """
+    yield plan
@@ -0,0 +1,195 @@
+"""
+Profiling of slide builds.
+
+Each slide is timed in three phases: construction (creating the figure),
+drawing (with the output renderer) and serialization (everything else done
+while saving, e.g., compressing and writing streams, and exporting to other
+formats). The bytes written and the peak memory traced by `tracemalloc` are
+also recorded. Results are written as JSON and CSV, for comparison in CI, and
+summarized as a table.
+"""
+
+import csv
+import json
+import sys
+from time import perf_counter
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Not available on Windows.
+    resource = None
+
+
+#: The fields of a profile record, in order.
+FIELDS = ('section', 'slide', 'construct', 'draw', 'serialize', 'bytes',
+          'peak_memory')
+
+
+def _start_tracing():
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+
+
+def measure_slide(section, index, create, save, output):
+    """
+    Create and save one slide, measuring each phase.
+
+    Parameters
+    ----------
+    section : str
+        The name of the section the slide belongs to.
+    index : int
+        The index of the slide in its section.
+    create : callable
+        A function returning the slide figure.
+    save : callable
+        A function to save the slide figure.
+    output : file-like
+        The file being written, used to count bytes written.
+
+    Returns
+    -------
+    fig : matplotlib.figure.Figure
+        The slide figure.
+    record : dict
+        The measurements, with keys from `FIELDS`.
+    """
+    _start_tracing()
+    start_bytes = output.tell()
+
+    start = perf_counter()
+    fig = create()
+    constructed = perf_counter()
+
+    # The draw event is sent after the renderer has drawn the figure, but
+    # before the backend has finished writing it out.
+    drawn = []
+    cid = fig.canvas.mpl_connect('draw_event',
+                                 lambda event: drawn.append(perf_counter()))
+    save(fig)
+    saved = perf_counter()
+    fig.canvas.mpl_disconnect(cid)
+    drawn = drawn[0] if drawn else saved
+
+    record = {
+        'section': section,
+        'slide': index,
+        'construct': constructed - start,
+        'draw': drawn - constructed,
+        'serialize': saved - drawn,
+        'bytes': output.tell() - start_bytes,
+        'peak_memory': tracemalloc.get_traced_memory()[1],
+    }
+    return fig, record
+
+
+def measure_finalize(section, close, output):
+    """
+    Close a PDF, measuring the time and bytes written to do so.
+
+    Fonts and images shared by all slides are only written when the PDF is
+    closed, so this is recorded separately from any slide, with no *slide*
+    index.
+
+    Parameters
+    ----------
+    section : str
+        The name of the section (or sections) written to the PDF.
+    close : callable
+        A function that closes the PDF.
+    output : file-like
+        The file being written, used to count bytes written.
+
+    Returns
+    -------
+    dict
+        The measurements, with keys from `FIELDS`.
+    """
+    _start_tracing()
+    start_bytes = output.tell()
+    start = perf_counter()
+    close()
+    return {
+        'section': section,
+        'slide': None,
+        'construct': 0.0,
+        'draw': 0.0,
+        'serialize': perf_counter() - start,
+        'bytes': output.tell() - start_bytes,
+        'peak_memory': tracemalloc.get_traced_memory()[1],
+    }
+
+
+def summarize(records):
+    """
+    Combine profile records by section.
+
+    Times and bytes are summed, and the peak memory is the maximum.
+
+    Returns
+    -------
+    dict
+        Combined records by section name, in order of first appearance.
+    """
+    sections = {}
+    for record in records:
+        total = sections.setdefault(
+            record['section'],
+            {**dict.fromkeys(FIELDS, 0), 'section': record['section'],
+             'slide': 0})
+        if record['slide'] is not None:
+            total['slide'] += 1
+        for field in ('construct', 'draw', 'serialize', 'bytes'):
+            total[field] += record[field]
+        total['peak_memory'] = max(total['peak_memory'], record['peak_memory'])
+    return sections
+
+
+def write_report(records, prefix, font_time=None, file=sys.stdout):
+    """
+    Write profile records as JSON and CSV, and print a summary table.
+
+    Parameters
+    ----------
+    records : list of dict
+        The profile records, from `measure_slide` and `measure_finalize`.
+    prefix : str
+        The path prefix of the files to write; ``.json`` and ``.csv`` are
+        appended.
+    font_time : float, optional
+        The time taken to find fonts at startup.
+    file : file-like, default: sys.stdout
+        Where to print the summary table.
+    """
+    sections = summarize(records)
+    max_rss = None
+    if resource is not None:
+        # ru_maxrss is in KiB on Linux, but bytes on macOS.
+        scale = 1 if sys.platform == 'darwin' else 1024
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+    with open(f'{prefix}.json', 'w') as f:
+        json.dump({'font_time': font_time, 'max_rss': max_rss,
+                   'sections': list(sections.values()),
+                   'slides': records}, f, indent=2)
+    with open(f'{prefix}.csv', 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+
+    header = ('Section', 'Slides', 'Construct', 'Draw', 'Serialize', 'Bytes',
+              'Peak memory')
+    print(f'{header[0]:<20} {header[1]:>6} {header[2]:>10} {header[3]:>10} '
+          f'{header[4]:>10} {header[5]:>10} {header[6]:>12}', file=file)
+    for total in sections.values():
+        print(f'{total["section"]:<20} {total["slide"]:>6} '
+              f'{total["construct"]:>9.3f}s {total["draw"]:>9.3f}s '
+              f'{total["serialize"]:>9.3f}s {total["bytes"]:>10,} '
+              f'{total["peak_memory"] / 1024**2:>9.1f}MiB', file=file)
+    if font_time is not None:
+        print(f'Finding fonts took {font_time:.3f}s.', file=file)
+    if max_rss is not None:
+        print(f'Maximum resident memory of the main process was '
+              f'{max_rss / 1024**2:.1f}MiB.', file=file)
@@ -0,0 +1,163 @@
+"""
+A content-addressed cache of rendered sections, for incremental rebuilds.
+
+Each section (an entry in `PAGES` in `make.py`) is rendered to its own PDF
+file, named by a hash of everything that may affect its output:
+
+* the source of the module defining the section, and of the common modules
+  used to draw all slides;
+* the arguments passed to the section;
+* the fonts chosen by `mplslide.check_requirements`;
+* the version of Matplotlib;
+* any extra key material returned by a ``cache_key(*args)`` function defined
+  in the section's module, for sections that depend on external state.
+
+Unchanged sections may then be spliced into the output from the cache. The
+cache is kept to a maximum size by evicting the least-recently used files.
+"""
+
+import hashlib
+import inspect
+import os
+from pathlib import Path
+import sys
+import time
+
+import matplotlib
+import matplotlib.font_manager
+
+import mplslide
+
+
+#: The default directory in which to store cached sections.
+CACHE_DIR = '.slidecache'
+#: The default maximum size of the cache, in bytes.
+CACHE_SIZE = 256 * 1024**2
+#: Modules whose source affects every slide.
+COMMON_MODULES = ('mplslide', 'title')
+#: The age, in seconds, after which a temporary file is assumed to be left
+#: over from a build that was interrupted, rather than being written.
+STALE_TMP_AGE = 60 * 60
+
+
+def _module_source(name):
+    """
+    Return the source code of an imported module, as bytes.
+    """
+    return Path(inspect.getsourcefile(sys.modules[name])).read_bytes()
+
+
+class SlideCache:
+    """
+    A directory of rendered sections, addressed by their content hash.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path, default: `CACHE_DIR`
+        The directory in which to store cached sections.
+    max_size : int, default: `CACHE_SIZE`
+        The maximum total size of the cache, in bytes.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_size=CACHE_SIZE):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+
+    def key(self, page, *args, extra=None):
+        """
+        Compute the cache key for a section.
+
+        Parameters
+        ----------
+        page : callable
+            The section function.
+        *args
+            Any arguments to pass to *page*.
+        extra : object, optional
+            Any additional data that affects the output, e.g., PDF metadata.
+            Its `repr` must be stable between runs.
+
+        Returns
+        -------
+        str
+            The hexadecimal digest of the key.
+        """
+        module = page.__module__
+        digest = hashlib.sha256()
+
+        def update(value):
+            if isinstance(value, str):
+                value = value.encode()
+            # Length-prefix each field so that they cannot run together.
+            digest.update(b'%d:' % (len(value), ))
+            digest.update(value)
+
+        for name in (module, *COMMON_MODULES):
+            update(name)
+            update(_module_source(name))
+        update(page.__qualname__)
+        update(repr(args))
+        update(repr(extra))
+        for font in (mplslide.FONT, mplslide.LOGO_FONT):
+            update(matplotlib.font_manager.findfont(font))
+        update(matplotlib.__version__)
+        cache_key = getattr(sys.modules[module], 'cache_key', None)
+        if cache_key is not None:
+            update(repr(cache_key(*args)))
+
+        return digest.hexdigest()
+
+    def path(self, key):
+        """
+        Return the path of the cached PDF for *key*, whether it exists or not.
+        """
+        return self.directory / f'{key}.pdf'
+
+    def hit(self, key):
+        """
+        Return whether *key* is in the cache, and mark it as recently used.
+
+        Empty files (which older versions could leave for sections without
+        slides) are removed, and are not hits.
+        """
+        path = self.path(key)
+        try:
+            if not path.stat().st_size:
+                path.unlink()
+                return False
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def evict(self):
+        """
+        Remove least-recently used files until the cache fits in `max_size`.
+
+        Temporary files older than `STALE_TMP_AGE`, left over from interrupted
+        builds, are always removed.
+        """
+        stale = time.time() - STALE_TMP_AGE
+        for path in self.directory.glob('*.tmp'):
+            try:
+                if path.stat().st_mtime < stale:
+                    path.unlink()
+            except FileNotFoundError:
+                continue
+
+        entries = []
+        for path in self.directory.glob('*.pdf'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
@@ -6,16 +6,233 @@ Matplotlib repository.
 """
 
 from datetime import datetime
+from functools import partial
+import json
+from pathlib import Path
 import subprocess
 
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from matplotlib.font_manager import FontProperties
+from matplotlib.textpath import text_to_path
+from packaging.version import InvalidVersion, Version
 
 from mplslide import new_slide, slide_heading
 
 
-def slides(mpl_path):
+#: The font size of release labels.
+LABEL_SIZE = 24
+
+#: The name of the file, in the git directory of a checkout, in which to store
+#: the index of release tags and their dates.
+TAG_INDEX = 'mplslide-releases.json'
+
+
+def _git_dir(mpl_path):
+    """
+    Return the git directory that contains the refs of a checkout.
+
+    This handles checkouts that are worktrees or submodules, where ``.git`` is
+    a file pointing elsewhere.
+    """
+    git_dir = Path(mpl_path, '.git')
+    if git_dir.is_file():
+        _, _, target = git_dir.read_text().partition(':')
+        git_dir = Path(mpl_path, target.strip())
+    commondir = git_dir / 'commondir'
+    if commondir.is_file():
+        git_dir = git_dir / commondir.read_text().strip()
+    return git_dir
+
+
+def _read_tag_refs(git_dir):
+    """
+    Return the object IDs of all tags, reading refs without running git.
+
+    Parameters
+    ----------
+    git_dir : pathlib.Path
+        The git directory containing the refs.
+
+    Returns
+    -------
+    dict
+        A mapping from tag name to object ID.
+    """
+    tags = {}
+    try:
+        with open(git_dir / 'packed-refs') as f:
+            for line in f:
+                # Skip the header and peeled object IDs of annotated tags.
+                if line.startswith(('#', '^')):
+                    continue
+                object_id, _, ref = line.rstrip('\n').partition(' ')
+                if ref.startswith('refs/tags/'):
+                    tags[ref[len('refs/tags/'):]] = object_id
+    except FileNotFoundError:
+        pass
+    # Loose refs take precedence over packed ones.
+    tags_dir = git_dir / 'refs' / 'tags'
+    for path in tags_dir.rglob('*'):
+        if path.is_file():
+            tags[path.relative_to(tags_dir).as_posix()] = \
+                path.read_text().strip()
+    return tags
+
+
+def _run_git_tags(mpl_path):
+    """
+    Return the object IDs and dates of all tags, as found by git.
+
+    Returns
+    -------
+    dict
+        A mapping from tag name to a list of object ID and ISO date.
+    """
+    tags = subprocess.run(
+        ['git', 'tag', '-l',
+         '--format=%(refname:strip=2) %(objectname) %(creatordate:short)'],
+        cwd=mpl_path, capture_output=True, text=True, check=True)
+    result = {}
+    for item in tags.stdout.splitlines():
+        tag_name, object_id, date = item.split(' ', 2)
+        result[tag_name] = [object_id, date]
+    return result
+
+
+def is_release(tag_name):
+    """
+    Return whether a tag names a final release, i.e., not a pre-release.
+
+    Parameters
+    ----------
+    tag_name : str
+        The name of the tag, e.g., ``v3.3.0`` or ``v3.3.0rc1``.
+    """
+    try:
+        version = Version(tag_name)
+    except InvalidVersion:
+        return False
+    return not version.is_prerelease
+
+
+def cache_key(mpl_path):
+    """
+    Return data identifying the state of release tags in a checkout.
+
+    This is used by `slidecache` to invalidate the cached slide, and by
+    `releases` to invalidate its index, when tags are added or packed.
+
+    Parameters
+    ----------
+    mpl_path : str or pathlib.Path
+        Path to the Matplotlib checkout used to find release tags and dates.
+    """
+    git_dir = _git_dir(mpl_path)
+    key = []
+    for path in (git_dir / 'packed-refs', git_dir / 'refs' / 'tags'):
+        try:
+            key.append(path.stat().st_mtime_ns)
+        except FileNotFoundError:
+            key.append(None)
+    return key
+
+
+def releases(mpl_path):
+    """
+    Return the names and dates of all releases in a checkout.
+
+    The result is stored in an index (`TAG_INDEX`) in the checkout's git
+    directory, which is re-used until tag refs change. When they do, tags are
+    read directly from the refs, and git is only run if there are new or moved
+    release tags whose dates are not yet known.
+
+    Parameters
+    ----------
+    mpl_path : str or pathlib.Path
+        Path to the Matplotlib checkout used to find release tags and dates.
+
+    Returns
+    -------
+    names : list of str
+        The names of release tags, sorted by name as git does.
+    dates : numpy.ndarray of datetime64
+        The date of each release.
+    """
+    git_dir = _git_dir(mpl_path)
+    index_path = git_dir / TAG_INDEX
+    key = cache_key(mpl_path)
+    try:
+        index = json.loads(index_path.read_text())
+    except (FileNotFoundError, ValueError):
+        index = {}
+    known = index.get('releases', {})
+
+    if index.get('key') != key:
+        tags = {name: object_id
+                for name, object_id in _read_tag_refs(git_dir).items()
+                if is_release(name)}
+        if any(known.get(name, [None])[0] != object_id
+               for name, object_id in tags.items()):
+            known = {name: value
+                     for name, value in _run_git_tags(mpl_path).items()
+                     if is_release(name)}
+        else:
+            known = {name: known[name] for name in tags}
+        try:
+            index_path.write_text(json.dumps({'key': key, 'releases': known}))
+        except OSError:
+            pass  # The checkout may be read-only; just don't save the index.
+
+    names = sorted(known)
+    dates = np.array([known[name][1] for name in names], dtype='datetime64[D]')
+    return names, dates
+
+
+def stem_levels(x, widths, min_levels=6, max_levels=16, pad=6):
+    """
+    Compute stem levels such that labels on the same level do not overlap.
+
+    Levels alternate below and above the timeline, from longest to shortest,
+    e.g., ``[-5, 5, -3, 3, -1, 1]``, and are cycled through in order of
+    position. The fewest levels for which no label overlaps the next label on
+    the same level are used, up to *max_levels*. If labels still overlap with
+    that many levels, they are marked so that they may be left out.
+
+    Parameters
+    ----------
+    x : array-like of float
+        The position of each stem, in points, in ascending order.
+    widths : array-like of float
+        The width of the label of each stem, in points. Labels are placed to
+        the left of their stem.
+    min_levels, max_levels : int, default: 6, 16
+        The range of the number of levels to use; must be even.
+    pad : float, default: 6
+        The minimum space between labels on the same level, in points.
+
+    Returns
+    -------
+    levels : numpy.ndarray
+        The level of each stem.
+    fits : numpy.ndarray of bool
+        Whether the label of each stem does not overlap the previous label on
+        the same level.
+    """
+    x = np.asarray(x, dtype=float)
+    left = x - np.asarray(widths, dtype=float)
+    for n in range(min_levels, max_levels + 1, 2):
+        fits = np.ones(len(x), dtype=bool)
+        fits[n:] = left[n:] - pad > x[:-n]
+        if fits.all():
+            break
+    lengths = 2 * np.arange(n // 2)[::-1] + 1
+    levels = np.resize(np.column_stack([-lengths, lengths]).ravel(), len(x))
+    return levels, fits
+
+
+def history(mpl_path):
     """
     Create slide for release history.
 
@@ -28,33 +245,48 @@ def slides(mpl_path):
 
     slide_heading(fig, 'Release History')
 
-    tags = subprocess.run(['git', 'tag', '-l',
-                           '--format=%(refname:strip=2) %(creatordate:short)'],
-                          cwd=mpl_path, capture_output=True, text=True)
-    dates = []
-    names = []
-    for item in tags.stdout.splitlines():
-        tag_name, date = item.split(' ', 1)
-        if 'rc' not in tag_name and 'b' not in tag_name:
-            dates.append(datetime.fromisoformat(date))
-            names.append(tag_name)
+    names, dates = releases(mpl_path)
+    order = np.argsort(dates, kind='stable')
+    names = [names[i] for i in order]
+    dates = dates[order]
 
-    levels = np.tile([-5, 5, -3, 3, -1, 1],
-                     int(np.ceil(len(dates) / 6)))[:len(dates)]
+    # Only plot the last 5 years before SciPy 2020.
+    xlim = (datetime(2015, 7, 6), datetime(2020, 7, 6))
 
     ax = fig.add_axes((0.05, 0.11, 0.9, 0.7))
 
-    ax.vlines(dates, 0, levels, color="tab:red", linewidth=3)
-    ax.plot(dates, np.zeros_like(dates), "-o",
-            color="k", markerfacecolor="w", linewidth=3, markersize=10)
+    # Only releases in the visible range need stems and labels.
+    visible = ((dates >= np.datetime64(xlim[0])) &
+               (dates <= np.datetime64(xlim[1])))
+    visible_names = [name for name, v in zip(names, visible) if v]
+    visible_dates = dates[visible]
+
+    # Measure labels from font metrics, instead of drawing them, to find
+    # levels where they do not overlap.
+    xmin, xmax = mdates.date2num(xlim)
+    width = fig.get_figwidth() * 72 * ax.get_position().width
+    x = (mdates.date2num(visible_dates) - xmin) / (xmax - xmin) * width
+    prop = FontProperties(size=LABEL_SIZE)
+    label_widths = np.array([
+        text_to_path.get_text_width_height_descent(name, prop, ismath=False)[0]
+        for name in visible_names])
+    levels, fits = stem_levels(x, label_widths + 3)
+
+    ax.vlines(visible_dates, 0, levels, color="tab:red", linewidth=3)
+    if len(dates):
+        ax.plot(dates[[0, -1]], [0, 0], "-", color="k", linewidth=3)
+    ax.plot(visible_dates, np.zeros(len(visible_dates)), "o",
+            color="k", markerfacecolor="w", markersize=10)
 
-    # Annotate lines.
-    for d, l, r in zip(dates, levels, names):
+    # Annotate lines, except where labels would overlap.
+    for d, l, r, fit in zip(visible_dates, levels, visible_names, fits):
+        if not fit:
+            continue
         ax.annotate(r, xy=(d, l),
                     xytext=(-3, np.sign(l)*3), textcoords="offset points",
                     horizontalalignment="right",
                     verticalalignment="bottom" if l > 0 else "top",
-                    fontsize=24)
+                    fontsize=LABEL_SIZE)
 
     # Format xaxis with 4 month intervals.
     ax.get_xaxis().set_major_locator(mdates.MonthLocator(interval=4))
@@ -71,7 +303,33 @@ def slides(mpl_path):
     # Annotate range between SciPy 2019 and SciPy 2020.
     ax.axvspan(datetime(2019, 7, 8), datetime(2020, 7, 6), alpha=0.5)
 
-    # Only plot the last 5 years before SciPy 2020.
-    ax.set_xlim(datetime(2015, 7, 6), datetime(2020, 7, 6))
+    ax.set_xlim(*xlim)
 
     return fig
+
+
+def prefetch(mpl_path):
+    """
+    Update the index of releases, so that the slide need not wait for git.
+
+    This is called by `make.py` before rendering the slide, overlapping with
+    rendering other sections.
+
+    Parameters
+    ----------
+    mpl_path : str or pathlib.Path
+        Path to the Matplotlib checkout used to find release tags and dates.
+    """
+    releases(mpl_path)
+
+
+def slides(mpl_path):
+    """
+    Return slides for this section.
+
+    Parameters
+    ----------
+    mpl_path : str or pathlib.Path
+        Path to the Matplotlib checkout used to find release tags and dates.
+    """
+    yield partial(history, mpl_path)
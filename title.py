@@ -5,15 +5,29 @@ Also creates an inset Axes that plots the logo for the corner of a slide. This
 file is based on `examples/misc/logos2.py` in the Matplotlib repository.
 """
 
+from functools import lru_cache
+
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.cm as cm
+from matplotlib.artist import Artist
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from matplotlib.patches import Rectangle, PathPatch
-from matplotlib.textpath import TextPath
 import matplotlib.transforms as mtrans
 
 
-from mplslide import MPL_BLUE, LOGO_FONT, FONT, new_slide
+from mplslide import (MPL_BLUE, LOGO_FONT, FONT, FIGSIZE, new_slide,
+                      text_path)
+
+
+#: The position of the logo in the corner of a slide, in figure coordinates.
+ICON_POSITION = (0.825, 0.825, 0.2, 0.15)
+#: The space to leave around the logo when pre-rendering it, in inches. The
+#: background and border of the logo extend a bit beyond its Axes.
+ICON_MARGIN = 0.1
+#: The resolution at which to pre-render the logo for vector output.
+ICON_DPI = 200
 
 
 def create_icon_axes(fig, ax_position, lw_bars, lw_grid, lw_border, rgrid):
@@ -71,13 +85,107 @@ def create_icon_axes(fig, ax_position, lw_bars, lw_grid, lw_border, rgrid):
         return ax
 
 
+def _icon_bounds():
+    """
+    Return the bounds of the pre-rendered logo on a slide, in inches.
+
+    The logo is a polar Axes, so it only fills a square in the centre of
+    `ICON_POSITION`.
+    """
+    x, y, w, h = ICON_POSITION
+    width = FIGSIZE[0] * w
+    height = FIGSIZE[1] * h
+    size = min(width, height)
+    return (FIGSIZE[0] * x + (width - size) / 2 - ICON_MARGIN,
+            FIGSIZE[1] * y + (height - size) / 2 - ICON_MARGIN,
+            size + 2 * ICON_MARGIN, size + 2 * ICON_MARGIN)
+
+
+@lru_cache()
+def icon_image(dpi):
+    """
+    Render the logo for the corner of a slide into an image.
+
+    The result is cached, so the logo is only rendered once per resolution.
+
+    Parameters
+    ----------
+    dpi : float
+        The resolution of the image.
+
+    Returns
+    -------
+    numpy.ndarray
+        The RGBA image, covering the bounds of the logo plus a
+        margin of `ICON_MARGIN`.
+    """
+    _, _, width, height = _icon_bounds()
+    fig = Figure(figsize=(width, height), dpi=dpi)
+    fig.patch.set_visible(False)
+    canvas = FigureCanvasAgg(fig)
+    create_icon_axes(fig,
+                     (ICON_MARGIN / width, ICON_MARGIN / height,
+                      1 - 2 * ICON_MARGIN / width,
+                      1 - 2 * ICON_MARGIN / height),
+                     0.3, 0.3, 0.3, [5])
+    canvas.draw()
+    # Renderers expect images with the bottom row first.
+    return np.ascontiguousarray(np.asarray(canvas.buffer_rgba())[::-1])
+
+
+class IconArtist(Artist):
+    """
+    An artist that draws the pre-rendered logo in the corner of a slide.
+
+    The same image object is passed to the renderer on every slide, so the PDF
+    backend (which de-duplicates images by identity) only stores it once per
+    file.
+    """
+
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+        fig = self.figure
+        x, y, width, height = _icon_bounds()
+        bbox = mtrans.Bbox.from_bounds(x, y, width, height).transformed(
+            fig.dpi_scale_trans)
+
+        gc = renderer.new_gc()
+        if renderer.option_scale_image():
+            # Vector output; use one high-resolution image, scaled to fit.
+            trans = mtrans.Affine2D().scale(bbox.width, bbox.height)
+            renderer.draw_image(gc, bbox.x0, bbox.y0, icon_image(ICON_DPI),
+                                trans)
+        else:
+            # Raster output; use an image rendered at exactly this resolution.
+            renderer.draw_image(gc, round(bbox.x0), round(bbox.y0),
+                                icon_image(fig.dpi))
+        gc.restore()
+        self.stale = False
+
+
+def add_icon(fig):
+    """
+    Add the pre-rendered logo to the corner of a slide.
+
+    This looks the same as `create_icon_axes` at `ICON_POSITION`, but the logo
+    is only drawn once for all slides.
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        The slide figure.
+    """
+    fig.add_artist(IconArtist())
+
+
 def create_text_axes(fig, height_px):
     """Create an axes in *fig* that contains 'matplotlib' as Text."""
     ax = fig.add_axes((0, 0.4, 1, 0.5))
     ax.set_aspect("equal")
     ax.set_axis_off()
 
-    path = TextPath((0, 0), "matplotlib", size=height_px * 0.8, prop=LOGO_FONT)
+    path = text_path("matplotlib", height_px * 0.8, LOGO_FONT)
 
     angle = 4.25  # degrees
     trans = mtrans.Affine2D().skew_deg(angle, 0)
@@ -88,7 +196,7 @@ def create_text_axes(fig, height_px):
     ax.autoscale()
 
 
-def slides():
+def title():
     """
     Create the title slide.
     """
@@ -104,3 +212,10 @@ def slides():
              fontproperties=FONT, color='C0', fontsize=72)
 
     return fig
+
+
+def slides():
+    """
+    Return slides for this section.
+    """
+    yield title